@@ -3,14 +3,31 @@
 # Adapted from https://github.com/e-tinkers/simple_httpserver/blob/master/simple_webserver.py
 
 import RPi.GPIO as GPIO
+import atexit
+import collections
+import ctypes
 import os
+import subprocess
 import threading
 import Adafruit_DHT
-from time import sleep
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from time import monotonic
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
 
-running = True
-temp_humidity_str = "Loading DHT11..."
+shutdown_event = threading.Event()
+# Single-slot handoff from the DHT thread to the HTTP threads. Holds the
+# latest reading: a (temperature, humidity) tuple or an error message.
+# Empty until the first read.
+dht11_latest = collections.deque(maxlen=1)
+cached_page = None  # (key, encoded page) from the last render
+cpu_temp_str = "?"
+gpu_temp_str = "?"
+DHT11_PIN = 17
+DHT11_MAX_MISSES = 15  # consecutive failed reads before reporting an error
+LINUX_REBOOT_CMD_POWER_OFF = 0x4321FEDC
+THERMAL_PATH = "/sys/class/thermal/thermal_zone0/temp"
+GPU_TEMP_INTERVAL = 10.0  # seconds between vcgencmd runs
+GPU_TEMP_TIMEOUT = 1.5  # seconds before giving up on a stuck vcgencmd
 host_name = "0.0.0.0"  # Change this to your Raspberry Pi IP address
 host_port = 8080  # Cam feed running on port 8000
 
@@ -45,44 +62,23 @@ GPIO_list = [
     pGPIO(26, 0, ""),
     pGPIO(27, 1, "DHT11"),
 ]
+GPIO_BY_PIN = {gpio.pin: gpio for gpio in GPIO_list}
 
 def find_gpio_by_pin(pin_number):
-  for gpio in GPIO_list:
-    if gpio.pin == pin_number:
-      return gpio
-  return None  # Return None if not found
+  return GPIO_BY_PIN.get(pin_number)  # Return None if not found
 
-class MyServer(BaseHTTPRequestHandler):
-    global temp_humidity_str
+gpio_lock = threading.Lock()
 
-    def do_HEAD(self):
-        self.send_response(200)
-        self.send_header("Content-type", "text/html")
-        self.end_headers()
+def set_gpio(gpio, state):
+  # Every pin is an output owned by this script, so gpio.state mirrors the
+  # pin level and the page never has to read the pins back. The lock keeps
+  # the pin and its shadow state in step when request threads race.
+  with gpio_lock:
+    GPIO.output(gpio.pin, GPIO.HIGH if state else GPIO.LOW)
+    gpio.state = state
 
-    def _redirect(self, path):
-        self.send_response(303)
-        self.send_header("Content-type", "text/html")
-        self.send_header("Location", path)
-        self.end_headers()
-
-    def do_GET(self):
-        # Update GPIO output
-        if "shutdown" in self.path:
-            os.popen("sudo shutdown -h now")
-        elif "=" in self.path:
-            post_data = self.path[1:].split("=")
-            gpio_pin = int(post_data[0])
-            GPIO.output(
-                find_gpio_by_pin(gpio_pin).pin,
-                GPIO.HIGH if post_data[1] == "On" else GPIO.LOW,
-            )
-
-        # Get GPIO states
-        for i in range(len(GPIO_list)):
-            GPIO_list[i].state = GPIO.input(GPIO_list[i].pin)
-
-        html = """
+# Static page markup, built once; only the dynamic fields are formatted per request
+HTML_HEAD = """
             <html>
             <head>
             <meta name="viewport" content="width=device-width, initial-scale=1">
@@ -105,75 +101,192 @@ class MyServer(BaseHTTPRequestHandler):
             <p>CPU Temp = {} &emsp; GPU Temp = {}</p>
             <p>{}</p>
             """
-        for i in range(len(GPIO_list)):
-            html += """
+ROW_TEMPLATE = """
             <form action="/" method="POST">
-                GPIO {0}
-                <span class="dot" state="{1}"></span>
-                <input type="submit" name="{0}" value="On">
-                <input type="submit" name="{0}" value="Off">
-                {2}
-            </form>""".format(
-                str(GPIO_list[i].pin), GPIO_list[i].state, GPIO_list[i].alias
-            )
-
-        html += """
+                GPIO {pin}
+                <span class="dot" state="{state}"></span>
+                <input type="submit" name="{pin}" value="On">
+                <input type="submit" name="{pin}" value="Off">
+                {alias}
+            </form>"""
+HTML_TAIL = """
             </body>
             </html>"""
+# Each row has only two possible renderings (off/on), so render both up front
+ROWS_BY_PIN = {
+    gpio.pin: tuple(
+        ROW_TEMPLATE.format(pin=gpio.pin, state=state, alias=gpio.alias)
+        for state in (0, 1)
+    )
+    for gpio in GPIO_list
+}
+
+def latest_dht11():
+    try:
+        return dht11_latest[-1]
+    except IndexError:
+        return None
+
+def format_temp_humidity(reading):
+    if reading is None:
+        return "Loading DHT11..."
+    if isinstance(reading, str):
+        return reading
+    return 'Room Temp = {0:0.1f} C &emsp; Humidity = {1:0.1f} %'.format(*reading)
+
+def power_off():
+    # With CAP_SYS_BOOT (e.g. AmbientCapabilities=CAP_SYS_BOOT in the systemd
+    # unit) power off directly through reboot(2); otherwise fall back to
+    # shutdown(8) via sudo, without a shell and without leaking a pipe.
+    try:
+        libc = ctypes.CDLL("libc.so.6", use_errno=True)
+        libc.sync()
+        libc.reboot(LINUX_REBOOT_CMD_POWER_OFF)  # only returns on failure
+    except OSError:
+        pass
+    subprocess.Popen(["sudo", "shutdown", "-h", "now"])
+
+def render_page():
+    # The page only changes when a pin, a temperature or the DHT reading
+    # does, so reuse the encoded bytes until one of those moves
+    global cached_page
+
+    reading = latest_dht11()
+    key = (cpu_temp_str, gpu_temp_str, reading, tuple(gpio.state for gpio in GPIO_list))
+    page = cached_page
+    if page is not None and page[0] == key:
+        return page[1]
 
-        cpu_temp = os.popen("cat /sys/class/thermal/thermal_zone0/temp").read()
-        gpu_temp = os.popen("vcgencmd measure_temp").read()
-        self.do_HEAD()
+    html = "".join(ROWS_BY_PIN[gpio.pin][gpio.state] for gpio in GPIO_list)
+    body = (
+        HTML_HEAD.format(cpu_temp_str, gpu_temp_str, format_temp_humidity(reading))
+        + html
+        + HTML_TAIL
+    ).encode("utf-8")
+    cached_page = (key, body)
+    return body
+
+class MyServer(BaseHTTPRequestHandler):
+    # Set TCP_NODELAY on each connection so short replies aren't held back by Nagle
+    disable_nagle_algorithm = True
+    # Every response carries Content-Length, so connections can be kept alive
+    protocol_version = "HTTP/1.1"
 
+    def _send_page(self, body, include_body=True):
+        # Status line, headers and body go out in a single write
+        self.log_request(200)
         self.wfile.write(
-            html.format(
-                str(round(int(cpu_temp) / 1000, 1)) + " C", gpu_temp[5:-3] + " C",
-                temp_humidity_str
-            ).encode("utf-8")
+            b"%s 200 OK\r\nContent-Type: text/html\r\nContent-Length: %d\r\n\r\n%s"
+            % (self.protocol_version.encode("ascii"), len(body), body if include_body else b"")
         )
 
+    def do_HEAD(self):
+        self._send_page(render_page(), include_body=False)
+
+    def _redirect(self, path):
+        self.send_response(303)
+        self.send_header("Content-type", "text/html")
+        self.send_header("Location", path)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        # Update GPIO output
+        if url.path == "/shutdown":
+            power_off()
+        else:
+            for pin, value in parse_qsl(url.query):
+                gpio = find_gpio_by_pin(int(pin)) if pin.isascii() and pin.isdecimal() else None
+                if gpio is not None:
+                    set_gpio(gpio, 1 if value == "On" else 0)
+
+        self._send_page(render_page())
+
     def do_POST(self):
         content_length = int(self.headers["Content-Length"])  # Get the size of data
         post_data = self.rfile.read(content_length).decode("utf-8")  # Get the data
-        self._redirect("/" + post_data)
+        self._redirect("/?" + post_data)
 
 
-def poll_dht11():
-    global running
-    global temp_humidity_str
+def poll_temps():
+    global cpu_temp_str
+    global gpu_temp_str
+
+    # Keep the sysfs file open and re-read it from offset 0 each time
+    try:
+        thermal_fd = os.open(THERMAL_PATH, os.O_RDONLY)
+        atexit.register(os.close, thermal_fd)
+    except OSError:
+        thermal_fd = None
 
+    next_gpu_read = 0.0
+    while not shutdown_event.is_set():
+        try:
+            cpu_temp_str = str(round(int(os.pread(thermal_fd, 16, 0)) / 1000, 1)) + " C"
+        except (OSError, TypeError, ValueError):
+            cpu_temp_str = "?"
+        # vcgencmd is a whole process spawn, so sample it less often than sysfs
+        if monotonic() >= next_gpu_read:
+            next_gpu_read = monotonic() + GPU_TEMP_INTERVAL
+            try:
+                gpu_temp = subprocess.run(
+                    ["vcgencmd", "measure_temp"], capture_output=True, text=True,
+                    timeout=GPU_TEMP_TIMEOUT,
+                ).stdout
+                gpu_temp_str = gpu_temp[5:-3] + " C"
+            except (OSError, subprocess.TimeoutExpired):
+                gpu_temp_str = "?"
+        shutdown_event.wait(2.0)
+
+
+def poll_dht11():
+    # One bit-banged read per cycle. read_retry would re-run the busy-waiting
+    # read up to 15 times back-to-back on a miss; instead a miss keeps the last
+    # good reading and the next attempt waits out the sensor's 2s sample period.
     sensor = Adafruit_DHT.DHT11
-    while running:
+    misses = 0
+    have_reading = False
+    while not shutdown_event.is_set():
         try:
-            humidity, temperature = Adafruit_DHT.read_retry(sensor, 17)
+            humidity, temperature = Adafruit_DHT.read(sensor, DHT11_PIN)
             if humidity is not None and temperature is not None:
-                temp_humidity_str = 'Room Temp = {0:0.1f} C &emsp; Humidity = {1:0.1f} %'.format(temperature, humidity)
+                dht11_latest.append((temperature, humidity))
+                misses = 0
+                have_reading = True
             else:
-                temp_humidity_str = "DHT11 error"
+                misses += 1
+                if misses >= DHT11_MAX_MISSES or not have_reading:
+                    dht11_latest.append("DHT11 error")
+                    have_reading = False
         except RuntimeError as error:
-            temp_humidity_str = "DHT11 error (1)"
-            sleep(2.0)
-            continue
+            dht11_latest.append("DHT11 error (1)")
+            have_reading = False
         except Exception as error:
-            temp_humidity_str = "DHT11 error (2)"
+            dht11_latest.append("DHT11 error (2)")
             raise error
-        sleep(2.0)
+        shutdown_event.wait(2.0)
 
 
 if __name__ == "__main__":
     # GPIO setup
     GPIO.setmode(GPIO.BCM)
     GPIO.setwarnings(False)
-    for i in range(len(GPIO_list)):
-        GPIO.setup(GPIO_list[i].pin, GPIO.OUT)
+    for gpio in GPIO_list:
+        GPIO.setup(gpio.pin, GPIO.OUT)
     for gpio in GPIO_list:
         if (gpio.state == 1):
-            GPIO.output(gpio.pin, GPIO.HIGH)
+            set_gpio(gpio, 1)
+        else:
+            gpio.state = GPIO.input(gpio.pin)
 
-    http_server = HTTPServer((host_name, host_port), MyServer)
+    # Threaded server so a slow client can't stall other requests
+    http_server = ThreadingHTTPServer((host_name, host_port), MyServer)
     print("Server Starts - %s:%s" % (host_name, host_port))
     dht11_thread = threading.Thread(target=poll_dht11)
     dht11_thread.start()
+    temps_thread = threading.Thread(target=poll_temps)
+    temps_thread.start()
 
     try:
         http_server.serve_forever()
@@ -181,5 +294,6 @@ if __name__ == "__main__":
         http_server.server_close()
 
     print("Server Stop")
-    running = False
+    shutdown_event.set()
     dht11_thread.join()
+    temps_thread.join()
@@ -11,6 +11,20 @@ from .controls import (
     run_lightning, run_waterfall, run_fungi
 )
 
+# Continuous effects, run in a background thread until stop_event is set
+EFFECT_FUNCS = {
+    "rainbow_in_unison": run_rainbow_in_unison,
+    "rainbow": run_rainbow,
+    "spooky": run_spooky,
+    "party": run_party,
+    "reactive": run_reactive,
+    "seasonal": run_seasonal,
+    "danger": run_danger,
+    "lightning": run_lightning,
+    "waterfall": run_waterfall,
+    "fungi": run_fungi,
+}
+
 
 def main():
     config = load_config()
@@ -23,7 +37,7 @@ def main():
         print("Use 'rescan' option to refresh the bulb list.")
     else:
         print(f"Scanning {base_ip}.0-255 (no broadcast) for WIZ devices...")
-        discovered = scan_ip_range(base_ip=base_ip, start=0, end=255, workers=80)
+        discovered = scan_ip_range(base_ip=base_ip, start=0, end=255)
         if discovered:
             save_cache(discovered)
             print(f"Found {len(discovered)} bulb(s). Cached for future use.")
@@ -53,15 +67,16 @@ def main():
         # Handle rescan
         if effect == "rescan":
             print(f"\nRescanning {base_ip}.0-255 for WIZ devices...")
-            discovered = scan_ip_range(base_ip=base_ip, start=0, end=255, workers=80)
+            discovered = scan_ip_range(base_ip=base_ip, start=0, end=255)
             if discovered:
                 save_cache(discovered)
                 print(f"Found {len(discovered)} bulb(s). Cache updated.")
             else:
                 print("No bulbs found during rescan.")
-            ips = sorted(discovered.keys())
+            ip_set = set(discovered)
+            ips = sorted(ip_set)
             # Re-select if current selection is invalid
-            selected = [ip for ip in selected if ip in ips]
+            selected = [ip for ip in selected if ip in ip_set]
             if not selected:
                 selected = prompt_user_selection(ips, discovered)
                 if not selected:
@@ -103,30 +118,9 @@ def main():
             run_synth(selected, stop_event)
         
         # Handle continuous effects
-        elif effect in ["rainbow_in_unison", "rainbow", "spooky", "party", "reactive", "seasonal", "danger", "lightning", "waterfall", "fungi"]:
+        elif (effect_func := EFFECT_FUNCS.get(effect)) is not None:
             # Run effect in background thread
-            if effect == "rainbow_in_unison":
-                effect_thread = threading.Thread(target=run_rainbow_in_unison, args=(selected, stop_event))
-            elif effect == "rainbow":
-                effect_thread = threading.Thread(target=run_rainbow, args=(selected, stop_event))
-            elif effect == "spooky":
-                effect_thread = threading.Thread(target=run_spooky, args=(selected, stop_event))
-            elif effect == "party":
-                effect_thread = threading.Thread(target=run_party, args=(selected, stop_event))
-            elif effect == "reactive":
-                effect_thread = threading.Thread(target=run_reactive, args=(selected, stop_event))
-            elif effect == "seasonal":
-                effect_thread = threading.Thread(target=run_seasonal, args=(selected, stop_event))
-            elif effect == "danger":
-                effect_thread = threading.Thread(target=run_danger, args=(selected, stop_event))
-            elif effect == "lightning":
-                effect_thread = threading.Thread(target=run_lightning, args=(selected, stop_event))
-            elif effect == "waterfall":
-                effect_thread = threading.Thread(target=run_waterfall, args=(selected, stop_event))
-            elif effect == "fungi":
-                effect_thread = threading.Thread(target=run_fungi, args=(selected, stop_event))
-            
-            effect_thread.daemon = True
+            effect_thread = threading.Thread(target=effect_func, args=(selected, stop_event), daemon=True)
             effect_thread.start()
             
             # Wait for user to press Enter to change mode
@@ -1,8 +1,8 @@
 """
 Color conversion utilities for WIZ lights.
 """
-import colorsys
 import math
+from functools import lru_cache
 from typing import Tuple
 
 
@@ -10,12 +10,34 @@ def hsv_to_rgb_255(h_deg: float, s: float, v: float) -> Tuple[int, int, int]:
     """
     Convert HSV (h in degrees 0-360, s and v in 0-1) to RGB 0-255 ints.
     """
-    h = (h_deg % 360) / 360.0
-    r, g, b = colorsys.hsv_to_rgb(h, s, v)
-    return int(r * 255), int(g * 255), int(b * 255)
+    # colorsys.hsv_to_rgb inlined with the same arithmetic: no extra call, each
+    # channel is scaled to 0-255 once, and only the channel the sextant needs
+    # besides v and p is computed
+    h6 = (h_deg % 360) / 360.0 * 6.0
+    i = int(h6)
+    f = h6 - i
+    V = int(v * 255)
+    P = int(v * (1.0 - s) * 255)
+    i %= 6
+    if i == 0:
+        return V, int(v * (1.0 - s * (1.0 - f)) * 255), P
+    if i == 1:
+        return int(v * (1.0 - s * f) * 255), V, P
+    if i == 2:
+        return P, V, int(v * (1.0 - s * (1.0 - f)) * 255)
+    if i == 3:
+        return P, int(v * (1.0 - s * f) * 255), V
+    if i == 4:
+        return int(v * (1.0 - s * (1.0 - f)) * 255), P, V
+    return V, P, int(v * (1.0 - s * f) * 255)
 
 
-def kelvin_to_rgb_255(kelvin: int) -> Tuple[int, int, int]:
+# Fully saturated, full-value RGB for each whole-degree hue, for the rainbow effects
+HUE_LUT = tuple(hsv_to_rgb_255(float(h), 1.0, 1.0) for h in range(360))
+
+
+@lru_cache(maxsize=512)
+def _kelvin_to_rgb_255_slow(kelvin: int) -> Tuple[int, int, int]:
     """
     Convert color temperature in Kelvin to RGB 0-255 ints.
     Based on algorithm from Tanner Helland.
@@ -23,31 +45,40 @@ def kelvin_to_rgb_255(kelvin: int) -> Tuple[int, int, int]:
     # Clamp temperature to reasonable range
     temp = max(1000, min(40000, kelvin)) / 100.0
     
-    # Calculate red
     if temp <= 66:
+        # Warm: red saturated, green on a log curve, blue off until 19
+        # (and saturated again exactly at 66)
         r = 255
+        g = 99.4708025861 * math.log(temp) - 161.1195681661
+        if temp == 66:
+            b = 255
+        elif temp <= 19:
+            b = 0
+        else:
+            b = 138.5177312231 * math.log(temp - 10) - 305.0447927307
     else:
-        r = temp - 60
-        r = 329.698727446 * (r ** -0.1332047592)
-        r = max(0, min(255, r))
-    
-    # Calculate green
-    if temp <= 66:
-        g = temp
-        g = 99.4708025861 * math.log(g) - 161.1195681661
-    else:
-        g = temp - 60
-        g = 288.1221695283 * (g ** -0.0755148492)
-    g = max(0, min(255, g))
-    
-    # Calculate blue
-    if temp >= 66:
+        # Cool: red and green fall off as power curves, blue saturated
+        r = 329.698727446 * ((temp - 60) ** -0.1332047592)
+        g = 288.1221695283 * ((temp - 60) ** -0.0755148492)
         b = 255
-    elif temp <= 19:
-        b = 0
-    else:
-        b = temp - 10
-        b = 138.5177312231 * math.log(b) - 305.0447927307
-        b = max(0, min(255, b))
     
-    return int(r), int(g), int(b)
+    return (
+        int(0 if r < 0 else 255 if r > 255 else r),
+        int(0 if g < 0 else 255 if g > 255 else g),
+        int(0 if b < 0 else 255 if b > 255 else b),
+    )
+
+
+# kelvin_to_rgb_255 for every 100K step of the 1000K-10000K range the UI accepts
+KELVIN_LUT = tuple(_kelvin_to_rgb_255_slow(k) for k in range(1000, 10001, 100))
+
+
+def kelvin_to_rgb_255(kelvin: int) -> Tuple[int, int, int]:
+    """
+    Convert color temperature in Kelvin to RGB 0-255 ints.
+    Whole-hundred temperatures in 1000K-10000K come from KELVIN_LUT; anything
+    else is computed directly, so results are identical either way.
+    """
+    if 1000 <= kelvin <= 10000 and kelvin % 100 == 0:
+        return KELVIN_LUT[(kelvin - 1000) // 100]
+    return _kelvin_to_rgb_255_slow(kelvin)
@@ -1,15 +1,27 @@
 """
 Configuration and cache management for WIZ lights.
 """
+import copy
 import json
 import os
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+# orjson (optional, `uv sync --extra fast`) reads and writes the JSON files faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # File paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CACHE_FILE = os.path.join(SCRIPT_DIR, "wiz_bulb_cache.json")
 CONFIG_FILE = os.path.join(SCRIPT_DIR, "config.json")
 
+# Contents of the cache file as last loaded or saved, and the file's
+# (mtime, size) at that point, so an unchanged rescan doesn't rewrite it
+_cache_on_disk: Optional[Dict[str, dict]] = None
+_cache_stamp: Optional[Tuple[int, int]] = None
+
 
 def load_config() -> dict:
     """Load configuration from config.json, return defaults if not found."""
@@ -26,39 +38,73 @@ def load_config() -> dict:
         return default_config
     
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-            # Ensure base_ip exists
-            if "base_ip" not in config:
-                config["base_ip"] = "192.168.1"
-            return config
+        config = _read_json(CONFIG_FILE)
+        # Ensure base_ip exists
+        if "base_ip" not in config:
+            config["base_ip"] = "192.168.1"
+        return config
     except Exception as e:
         print(f"Warning: Could not load config file: {e}")
         return default_config
 
 
+def _read_json(path: str):
+    """Parse a JSON file, with orjson when it is installed."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read()) if orjson is not None else json.load(f)
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime in ns, size) of a file, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 def save_cache(discovered: Dict[str, dict]) -> None:
-    """Save discovered bulbs to cache file."""
+    """Save discovered bulbs to cache file, unless it already holds them."""
+    global _cache_on_disk, _cache_stamp
+    # The in-memory copy only vouches for the file if nothing has deleted or
+    # rewritten it since
+    if (discovered == _cache_on_disk and _cache_stamp is not None
+            and _file_stamp(CACHE_FILE) == _cache_stamp):
+        return
+    if orjson is not None:
+        data = orjson.dumps(discovered, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(discovered, indent=2).encode("utf-8")
+    # Write a temporary file and rename it over the cache, so a run killed
+    # mid-write never leaves a truncated cache behind
+    tmp = CACHE_FILE + ".tmp"
     try:
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(discovered, f, indent=2)
-        # Set restrictive permissions (owner read/write only)
-        os.chmod(CACHE_FILE, 0o600)
+        # Restrictive permissions (owner read/write only) from creation
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp, 0o600)  # in case a stale temp file had other modes
+        os.replace(tmp, CACHE_FILE)
+        _cache_on_disk = copy.deepcopy(discovered)
+        _cache_stamp = _file_stamp(CACHE_FILE)
     except Exception as e:
         print(f"Warning: Could not save cache: {e}")
 
 
 def load_cache() -> Optional[Dict[str, dict]]:
     """Load cached bulbs from cache file. Returns None if cache doesn't exist or is invalid."""
+    global _cache_on_disk, _cache_stamp
     if not os.path.exists(CACHE_FILE):
         return None
     
     try:
-        with open(CACHE_FILE, 'r') as f:
-            cache = json.load(f)
-            if isinstance(cache, dict) and cache:
-                return cache
-            return None
+        stamp = _file_stamp(CACHE_FILE)
+        cache = _read_json(CACHE_FILE)
+        if isinstance(cache, dict) and cache:
+            _cache_on_disk = copy.deepcopy(cache)
+            _cache_stamp = stamp
+            return cache
+        return None
     except Exception as e:
         print(f"Warning: Could not load cache: {e}")
         return None
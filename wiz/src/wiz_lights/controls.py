@@ -7,15 +7,76 @@ import time
 import random
 import math
 import sys
-import select
+import selectors
 import threading
 from datetime import datetime
 from typing import List
-from .colors import hsv_to_rgb_255, kelvin_to_rgb_255
-from .network import set_color_rgb
+from .colors import HUE_LUT, hsv_to_rgb_255, kelvin_to_rgb_255
+from .network import encode_rgb, send_all, set_all_rgb, set_colors_rgb
 
 # Constants
 SEND_INTERVAL = 0.12  # seconds between color updates
+# Per-channel color noise for spooky: every (r, g, b) offset in -8..8, so one
+# draw picks all three channels' noise
+_JITTER = tuple((r, g, b) for r in range(-8, 9) for g in range(-8, 9) for b in range(-8, 9))
+# Reactive modes map an audio level in [0, 1] to a color: blue when quiet,
+# red and brighter when loud. Sampled in 1/1000 steps, finer than a bulb's
+# 8-bit channels can show, so a frame's color is one table lookup
+_REACTIVE_STEPS = 1000
+_REACTIVE_LUT = tuple(
+    hsv_to_rgb_255((1.0 - i / _REACTIVE_STEPS) * 240, 0.9, 0.3 + (i / _REACTIVE_STEPS) * 0.7)
+    for i in range(_REACTIVE_STEPS + 1)
+)
+
+
+def _sleep(stop_event: threading.Event, seconds: float) -> bool:
+    """
+    Sleep between effect frames, waking immediately if stop_event is set.
+    Returns True if the effect should stop.
+    """
+    if stop_event is None:
+        time.sleep(seconds)
+        return False
+    return stop_event.wait(seconds)
+
+def _advance(deadline: float, period: float) -> float:
+    """
+    Next frame deadline, one period on. If the loop has fallen more than a
+    period behind (a stalled send, a suspended Pi), restart the cadence from
+    now rather than firing a burst of late frames to catch up.
+    """
+    deadline += period
+    now = time.monotonic()
+    if deadline < now - period:
+        return now
+    return deadline
+
+def _sleep_until(stop_event: threading.Event, deadline: float) -> bool:
+    """
+    Sleep until a time.monotonic() deadline, so frame work doesn't stretch the cadence.
+    Returns True if the effect should stop.
+    """
+    slack = deadline - time.monotonic()
+    if slack > 0:
+        return _sleep(stop_event, slack)
+    return bool(stop_event and stop_event.is_set())
+
+def _paced(stop_event: threading.Event, period: float, duration=None):
+    """
+    Yield once per frame, every period seconds on monotonic deadlines, until
+    stop_event is set or duration seconds have passed. Yields the seconds
+    elapsed since the effect started, for time-driven animations.
+    """
+    t0 = time.monotonic()
+    deadline = t0
+    while not (stop_event and stop_event.is_set()):
+        elapsed = time.monotonic() - t0
+        if duration and elapsed >= duration:
+            return
+        yield elapsed
+        deadline = _advance(deadline, period)
+        if _sleep_until(stop_event, deadline):
+            return
 
 def run_rainbow_in_unison(ips: List[str], stop_event: threading.Event = None, duration=None):
     """
@@ -24,19 +85,14 @@ def run_rainbow_in_unison(ips: List[str], stop_event: threading.Event = None, du
     stop_event: threading.Event to signal when to stop
     """
     print("Running rainbow_in_unison. Press Enter to stop or change mode.")
-    t0 = time.time()
-    hue = 0.0
+    # The hue walks 0-357 in 3° steps, so every frame the effect can send is
+    # known up front; encode the whole cycle once and step through it
+    ring = [encode_rgb(*HUE_LUT[hue]) for hue in range(0, 360, 3)]
+    tick = 0
     try:
-        while True:
-            if stop_event and stop_event.is_set():
-                break
-            if duration and (time.time() - t0) >= duration:
-                break
-            r, g, b = hsv_to_rgb_255(hue, 1.0, 1.0)
-            for ip in ips:
-                set_color_rgb(ip, r, g, b)
-            hue = (hue + 3.0) % 360
-            time.sleep(SEND_INTERVAL)
+        for _ in _paced(stop_event, SEND_INTERVAL, duration):
+            send_all(ips, ring[tick])
+            tick = (tick + 1) % len(ring)
     except KeyboardInterrupt:
         print("\nStopping effect.")
 
@@ -46,26 +102,20 @@ def run_rainbow(ips: List[str], stop_event: threading.Event = None, duration=Non
     stop_event: threading.Event to signal when to stop
     """
     print("Running rainbow. Press Enter to stop or change mode.")
-    t0 = time.time()
     base_hue = 0.0
-    offsets = []
     n = len(ips)
-    for i in range(n):
-        offsets.append((i * (360.0 / max(1, n))) % 360)
+    # Per-light (ip, hue offset, time-offset phase), fixed for the whole run
+    lights = [(ip, (i * (360.0 / max(1, n))) % 360, i * 7) for i, ip in enumerate(ips)]
+    lut = HUE_LUT
     try:
-        while True:
-            if stop_event and stop_event.is_set():
-                break
-            if duration and (time.time() - t0) >= duration:
-                break
-            for i, ip in enumerate(ips):
-                hue = (base_hue + offsets[i]) % 360
-                local_offset = (time.time() * 10.0 + i * 7) % 360
-                hue = (hue + local_offset * 0.02) % 360
-                r, g, b = hsv_to_rgb_255(hue, 1.0, 1.0)
-                set_color_rgb(ip, r, g, b)
+        for _ in _paced(stop_event, SEND_INTERVAL, duration):
+            now_x10 = time.monotonic() * 10.0  # one clock read per frame
+            # Whole-degree hue indexes the LUT; a single wrap at the end suffices
+            set_colors_rgb([
+                (ip, *lut[int(base_hue + offset + ((now_x10 + phase) % 360) * 0.02) % 360])
+                for ip, offset, phase in lights
+            ])
             base_hue = (base_hue + 2.0) % 360
-            time.sleep(SEND_INTERVAL)
     except KeyboardInterrupt:
         print("\nStopping effect.")
 
@@ -75,45 +125,60 @@ def run_spooky(ips: List[str], stop_event: threading.Event = None, duration=None
     stop_event: threading.Event to signal when to stop
     """
     print("Running spooky. Press Enter to stop or change mode.")
-    t0 = time.time()
-    last_strobe = time.time()
+    # Hot-loop callables bound to locals to skip global/attribute lookups
+    rand = random.random
+    jitter, n_jitter = _JITTER, len(_JITTER)
+    white, off = encode_rgb(255, 255, 255), encode_rgb(0, 0, 0)  # strobe frames
+    last_strobe = 0.0
     try:
-        while True:
-            if stop_event and stop_event.is_set():
-                break
-            if duration and (time.time() - t0) >= duration:
-                break
-            now = time.time()
+        for elapsed in _paced(stop_event, SEND_INTERVAL * 0.8, duration):
             # small chance to do a quick strobe across all lights
-            if now - last_strobe > 6.0 and random.random() < 0.09:
+            if elapsed - last_strobe > 6.0 and rand() < 0.09:
                 for flash in range(3):
-                    for ip in ips:
-                        set_color_rgb(ip, 255, 255, 255)
-                    time.sleep(0.06)
-                    for ip in ips:
-                        set_color_rgb(ip, 0, 0, 0)
-                    time.sleep(0.06)
-                last_strobe = now
-                continue
+                    send_all(ips, white)
+                    if _sleep(stop_event, 0.06):
+                        return
+                    send_all(ips, off)
+                    if _sleep(stop_event, 0.06):
+                        return
+                last_strobe = elapsed
+                continue  # the strobe replaces this frame
 
-            for i, ip in enumerate(ips):
-                base = "orange" if random.random() < 0.6 else "purple"
-                if base == "orange":
-                    hue = 30 + random.uniform(-8, 8)
-                    sat = 0.9 + random.uniform(-0.1, 0.0)
-                    val = 0.5 + random.uniform(-0.15, 0.25)
-                else:
-                    hue = 275 + random.uniform(-10, 10)
-                    sat = 0.8 + random.uniform(-0.1, 0.1)
-                    val = 0.3 + random.uniform(-0.12, 0.5)
-                if random.random() < 0.08:
-                    val = min(1.0, val + random.uniform(0.2, 0.6))
-                r, g, b = hsv_to_rgb_255(hue, max(0.0, min(1.0, sat)), max(0.0, min(1.0, val)))
-                r = int(max(0, min(255, r + random.randint(-8, 8))))
-                g = int(max(0, min(255, g + random.randint(-8, 8))))
-                b = int(max(0, min(255, b + random.randint(-8, 8))))
-                set_color_rgb(ip, r, g, b)
-            time.sleep(SEND_INTERVAL * 0.8)
+            frame = []
+            for ip in ips:
+                # sat/val ranges stay inside [0, 1], so only the flicker boost needs clamping.
+                # Ranges are drawn as lo + span * random(), which is what uniform() does
+                # Each palette stays inside one 60° HSV sector, so the conversion
+                # is inlined for that sector (same arithmetic as colorsys)
+                if rand() < 0.6:  # orange: 30±8°, sat 0.8-0.9, val 0.35-0.75
+                    f = (22 + 16 * rand()) / 360.0 * 6.0  # sector 0: (v, t, p)
+                    sat = 0.8 + 0.1 * rand()
+                    val = 0.35 + 0.4 * rand()
+                    if rand() < 0.08:
+                        val = min(1.0, val + 0.2 + 0.4 * rand())
+                    r = int(val * 255)
+                    g = int(val * (1.0 - sat * (1.0 - f)) * 255)
+                    b = int(val * (1.0 - sat) * 255)
+                else:  # purple: 275±10°, sat 0.7-0.9, val 0.18-0.8
+                    f = (265 + 20 * rand()) / 360.0 * 6.0 - 4  # sector 4: (t, p, v)
+                    sat = 0.7 + 0.2 * rand()
+                    val = 0.18 + 0.62 * rand()
+                    if rand() < 0.08:
+                        val = min(1.0, val + 0.2 + 0.4 * rand())
+                    r = int(val * (1.0 - sat * (1.0 - f)) * 255)
+                    g = int(val * (1.0 - sat) * 255)
+                    b = int(val * 255)
+                dr, dg, db = jitter[int(rand() * n_jitter)]
+                r += dr
+                g += dg
+                b += db
+                frame.append((
+                    ip,
+                    0 if r < 0 else 255 if r > 255 else r,
+                    0 if g < 0 else 255 if g > 255 else g,
+                    0 if b < 0 else 255 if b > 255 else b,
+                ))
+            set_colors_rgb(frame)
     except KeyboardInterrupt:
         print("\nStopping effect.")
 
@@ -124,8 +189,7 @@ def run_white(ips: List[str], kelvin: int = 4000):
     """
     print(f"Setting lights to white at {kelvin}K...")
     r, g, b = kelvin_to_rgb_255(kelvin)
-    for ip in ips:
-        set_color_rgb(ip, r, g, b)
+    set_all_rgb(ips, r, g, b)
     print("Done.")
 
 def run_rgba(ips: List[str], r: int, g: int, b: int, dimming: int):
@@ -134,8 +198,7 @@ def run_rgba(ips: List[str], r: int, g: int, b: int, dimming: int):
     This is a one-time setting, not a continuous effect.
     """
     print(f"Setting lights to RGB({r}, {g}, {b}) with {dimming}% brightness...")
-    for ip in ips:
-        set_color_rgb(ip, r, g, b, transition=0, dimming=dimming)
+    set_all_rgb(ips, r, g, b, transition=0, dimming=dimming)
     print("Done.")
 
 def run_party(ips: List[str], stop_event: threading.Event = None, duration=None):
@@ -144,49 +207,50 @@ def run_party(ips: List[str], stop_event: threading.Event = None, duration=None)
     stop_event: threading.Event to signal when to stop
     """
     print("Running party mode. Press Enter to stop or change mode.")
-    t0 = time.time()
+    uniform, randint, randrange, choice = random.uniform, random.randint, random.randrange, random.choice
+    off = encode_rgb(0, 0, 0)  # strobe's dark frame
+    t0 = time.monotonic()
     try:
         while True:
             if stop_event and stop_event.is_set():
                 break
-            if duration and (time.time() - t0) >= duration:
+            if duration and (time.monotonic() - t0) >= duration:
                 break
             
             # Random flash pattern
-            pattern = random.choice(["all_same", "individual", "strobe"])
+            pattern = choice(("all_same", "individual", "strobe"))
             
             if pattern == "all_same":
                 # All lights same random color
-                hue = random.uniform(0, 360)
-                sat = random.uniform(0.7, 1.0)
-                val = random.uniform(0.6, 1.0)
-                r, g, b = hsv_to_rgb_255(hue, sat, val)
-                for ip in ips:
-                    set_color_rgb(ip, r, g, b)
-                time.sleep(random.uniform(0.1, 0.4))
+                hue = uniform(0, 360)
+                sat = uniform(0.7, 1.0)
+                val = uniform(0.6, 1.0)
+                set_all_rgb(ips, *hsv_to_rgb_255(hue, sat, val))
+                if _sleep(stop_event, uniform(0.1, 0.4)):
+                    break
             
             elif pattern == "individual":
-                # Each light different random color
-                for ip in ips:
-                    hue = random.uniform(0, 360)
-                    sat = random.uniform(0.7, 1.0)
-                    val = random.uniform(0.5, 1.0)
-                    r, g, b = hsv_to_rgb_255(hue, sat, val)
-                    set_color_rgb(ip, r, g, b)
-                time.sleep(random.uniform(0.15, 0.5))
+                # Each light different random color, sent as one frame
+                set_colors_rgb([
+                    (ip, *hsv_to_rgb_255(
+                        uniform(0, 360), uniform(0.7, 1.0), uniform(0.5, 1.0)
+                    ))
+                    for ip in ips
+                ])
+                if _sleep(stop_event, uniform(0.15, 0.5)):
+                    break
             
             elif pattern == "strobe":
                 # Quick strobe
-                for _ in range(random.randint(2, 5)):
-                    hue = random.uniform(0, 360)
-                    r, g, b = hsv_to_rgb_255(hue, 1.0, 1.0)
-                    for ip in ips:
-                        set_color_rgb(ip, r, g, b)
-                    time.sleep(0.05)
-                    for ip in ips:
-                        set_color_rgb(ip, 0, 0, 0)
-                    time.sleep(0.05)
-                time.sleep(random.uniform(0.2, 0.6))
+                for _ in range(randint(2, 5)):
+                    set_all_rgb(ips, *HUE_LUT[randrange(360)])
+                    if _sleep(stop_event, 0.05):
+                        return
+                    send_all(ips, off)
+                    if _sleep(stop_event, 0.05):
+                        return
+                if _sleep(stop_event, uniform(0.2, 0.6)):
+                    break
     
     except KeyboardInterrupt:
         print("\nStopping effect.")
@@ -214,12 +278,18 @@ def run_synth(ips: List[str], stop_event: threading.Event = None):
         '9': (255, 255, 255),  # White
         '0': (0, 0, 0),        # Black (off)
     }
+    # Encoded up front; a keypress is one non-blocking sendmmsg, so the read
+    # loop never waits on the network
+    key_packets = {key: encode_rgb(r, g, b) for key, (r, g, b) in key_colors.items()}
     
     # Set terminal to non-blocking mode for key reading
     if sys.platform != 'win32':
         import tty
         import termios
         old_settings = termios.tcgetattr(sys.stdin)
+        # Register stdin once rather than rebuilding an fd set on every poll
+        sel = selectors.DefaultSelector()
+        sel.register(sys.stdin, selectors.EVENT_READ)
         try:
             tty.setcbreak(sys.stdin.fileno())
             while True:
@@ -227,7 +297,7 @@ def run_synth(ips: List[str], stop_event: threading.Event = None):
                     break
                 
                 # Check if key is available
-                if select.select([sys.stdin], [], [], 0.05)[0]:
+                if sel.select(0.05):
                     key = sys.stdin.read(1)
                     
                     if key.lower() == 'q':
@@ -235,10 +305,10 @@ def run_synth(ips: List[str], stop_event: threading.Event = None):
                     
                     if key in key_colors:
                         r, g, b = key_colors[key]
-                        for ip in ips:
-                            set_color_rgb(ip, r, g, b)
+                        send_all(ips, key_packets[key])
                         print(f"Flash: {key} -> RGB({r}, {g}, {b})")
         finally:
+            sel.close()
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
     else:
         # Windows fallback - simpler input mode
@@ -252,8 +322,7 @@ def run_synth(ips: List[str], stop_event: threading.Event = None):
                     break
                 if key in key_colors:
                     r, g, b = key_colors[key]
-                    for ip in ips:
-                        set_color_rgb(ip, r, g, b)
+                    send_all(ips, key_packets[key])
                     print(f"Flash: {key} -> RGB({r}, {g}, {b})")
             except (EOFError, KeyboardInterrupt):
                 break
@@ -279,7 +348,8 @@ def run_reactive(ips: List[str], stop_event: threading.Event = None, duration=No
         print("Install with: uv sync --extra audio")
         print("Or on Debian/Ubuntu: sudo apt install portaudio19-dev && uv sync --extra audio")
         print("Falling back to simulated reactive mode...")
-        time.sleep(2)
+        if _sleep(stop_event, 2):
+            return
         # Fallback to simulated mode
         run_reactive_simulated(ips, stop_event, duration)
         return
@@ -289,8 +359,12 @@ def run_reactive(ips: List[str], stop_event: threading.Event = None, duration=No
     FORMAT = pyaudio.paInt16
     CHANNELS = 1
     RATE = 44100
+    SEND_EVERY = 0.05  # seconds between light updates
     
-    t0 = time.time()
+    t0 = time.monotonic()
+    # Reused for every chunk. float32 holds every int16 sample exactly, can't
+    # overflow when squared, and lets np.dot run as a single BLAS sdot
+    samples = np.empty(CHUNK, dtype=np.float32)
     
     try:
         p = pyaudio.PyAudio()
@@ -301,35 +375,34 @@ def run_reactive(ips: List[str], stop_event: threading.Event = None, duration=No
                        frames_per_buffer=CHUNK)
         
         print("Listening to microphone...")
+        next_send = 0.0
         
         while True:
             if stop_event and stop_event.is_set():
                 break
-            if duration and (time.time() - t0) >= duration:
+            if duration and (time.monotonic() - t0) >= duration:
                 break
             
             try:
-                # Read audio data
+                # Read audio data; the read blocks for CHUNK / RATE seconds,
+                # so the loop is paced by the microphone, not a sleep
                 data = stream.read(CHUNK, exception_on_overflow=False)
-                audio_data = np.frombuffer(data, dtype=np.int16)
                 
-                # Calculate audio level (RMS)
-                rms = np.sqrt(np.mean(audio_data**2))
+                # Only the latest chunk matters once it's time to update
+                now = time.monotonic()
+                if now < next_send:
+                    continue
+                next_send = now + SEND_EVERY
+                
+                # Calculate audio level (RMS) without temporary arrays
+                np.copyto(samples, np.frombuffer(data, dtype=np.int16))
+                rms = math.sqrt(float(np.dot(samples, samples)) / CHUNK)
                 
                 # Normalize to 0-1 range (adjust sensitivity)
                 level = min(1.0, rms / 5000.0)
                 
                 # Map audio level to color (low = blue, high = red)
-                hue = (1.0 - level) * 240  # 240 = blue, 0 = red
-                sat = 0.9
-                val = 0.3 + (level * 0.7)  # Brightness increases with volume
-                
-                r, g, b = hsv_to_rgb_255(hue, sat, val)
-                
-                for ip in ips:
-                    set_color_rgb(ip, r, g, b)
-                
-                time.sleep(0.05)  # Small delay for responsiveness
+                set_all_rgb(ips, *_REACTIVE_LUT[int(level * _REACTIVE_STEPS)])
                 
             except Exception as e:
                 print(f"Audio read error: {e}")
@@ -353,34 +426,19 @@ def run_reactive_simulated(ips: List[str], stop_event: threading.Event = None, d
     Creates a pulsing effect that simulates audio reactivity.
     """
     print("Running simulated reactive mode...")
-    t0 = time.time()
+    uniform = random.uniform
     
     try:
-        while True:
-            if stop_event and stop_event.is_set():
-                break
-            if duration and (time.time() - t0) >= duration:
-                break
-            
+        for elapsed in _paced(stop_event, SEND_INTERVAL, duration):
             # Simulate audio with sine wave
-            elapsed = time.time() - t0
             level = (math.sin(elapsed * 3.0) + 1.0) / 2.0  # 0-1
             
             # Add some randomness
-            level = level * random.uniform(0.7, 1.3)
+            level = level * uniform(0.7, 1.3)
             level = max(0.0, min(1.0, level))
             
             # Map to color
-            hue = (1.0 - level) * 240
-            sat = 0.9
-            val = 0.3 + (level * 0.7)
-            
-            r, g, b = hsv_to_rgb_255(hue, sat, val)
-            
-            for ip in ips:
-                set_color_rgb(ip, r, g, b)
-            
-            time.sleep(SEND_INTERVAL)
+            set_all_rgb(ips, *_REACTIVE_LUT[int(level * _REACTIVE_STEPS)])
             
     except KeyboardInterrupt:
         print("\nStopping effect.")
@@ -418,33 +476,31 @@ def run_seasonal(ips: List[str], stop_event: threading.Event = None, duration=No
         print(f"Current season: Fall")
         colors = [(255, 140, 0), (255, 100, 50), (200, 80, 40), (180, 50, 30)]
     
-    t0 = time.time()
+    # Every clamped ±15 variation of each palette channel, so a frame's
+    # variation is three table picks
+    variants = [
+        tuple(tuple(max(0, min(255, c + d)) for d in range(-15, 16)) for c in color)
+        for color in colors
+    ]
+    rand = random.random
     color_index = 0
     
     try:
-        while True:
-            if stop_event and stop_event.is_set():
-                break
-            if duration and (time.time() - t0) >= duration:
-                break
-            
+        for _ in _paced(stop_event, SEND_INTERVAL * 3, duration):
             # Gradually transition through seasonal colors
-            base_color = colors[color_index % len(colors)]
+            reds, greens, blues = variants[color_index % len(colors)]
             
             # Add subtle variation
-            r = max(0, min(255, base_color[0] + random.randint(-15, 15)))
-            g = max(0, min(255, base_color[1] + random.randint(-15, 15)))
-            b = max(0, min(255, base_color[2] + random.randint(-15, 15)))
+            r = reds[int(rand() * 31)]
+            g = greens[int(rand() * 31)]
+            b = blues[int(rand() * 31)]
             
-            for ip in ips:
-                set_color_rgb(ip, r, g, b)
+            set_all_rgb(ips, r, g, b)
             
             # Slow transition
-            if random.random() < 0.05:
+            if rand() < 0.05:
                 color_index += 1
             
-            time.sleep(SEND_INTERVAL * 3)
-            
     except KeyboardInterrupt:
         print("\nStopping effect.")
 
@@ -455,51 +511,49 @@ def run_danger(ips: List[str], stop_event: threading.Event = None, duration=None
     stop_event: threading.Event to signal when to stop
     """
     print("Running danger mode. Press Enter to stop or change mode.")
-    t0 = time.time()
+    uniform, randint, choice = random.uniform, random.randint, random.choice
+    t0 = time.monotonic()
+    # The strobe and pulse frames never change, so encode them once
+    red, off = encode_rgb(255, 0, 0), encode_rgb(0, 0, 0)
+    pulse = [encode_rgb(intensity, 0, 0) for intensity in range(0, 255, 20)]
+    pulse += [encode_rgb(intensity, 0, 0) for intensity in range(255, 0, -20)]
     
     try:
         while True:
             if stop_event and stop_event.is_set():
                 break
-            if duration and (time.time() - t0) >= duration:
+            if duration and (time.monotonic() - t0) >= duration:
                 break
             
             # Intense red strobe pattern
-            pattern = random.choice(["fast_strobe", "slow_pulse", "flicker"])
+            pattern = choice(("fast_strobe", "slow_pulse", "flicker"))
             
             if pattern == "fast_strobe":
                 # Rapid on/off
-                for _ in range(random.randint(3, 8)):
-                    for ip in ips:
-                        set_color_rgb(ip, 255, 0, 0)
-                    time.sleep(0.05)
-                    for ip in ips:
-                        set_color_rgb(ip, 0, 0, 0)
-                    time.sleep(0.05)
-                time.sleep(random.uniform(0.3, 0.8))
+                for _ in range(randint(3, 8)):
+                    send_all(ips, red)
+                    if _sleep(stop_event, 0.05):
+                        return
+                    send_all(ips, off)
+                    if _sleep(stop_event, 0.05):
+                        return
+                if _sleep(stop_event, uniform(0.3, 0.8)):
+                    break
             
             elif pattern == "slow_pulse":
                 # Pulsing red
-                for intensity in range(0, 255, 20):
-                    if stop_event and stop_event.is_set():
-                        break
-                    for ip in ips:
-                        set_color_rgb(ip, intensity, 0, 0)
-                    time.sleep(0.03)
-                for intensity in range(255, 0, -20):
-                    if stop_event and stop_event.is_set():
-                        break
-                    for ip in ips:
-                        set_color_rgb(ip, intensity, 0, 0)
-                    time.sleep(0.03)
+                for packet in pulse:
+                    send_all(ips, packet)
+                    if _sleep(stop_event, 0.03):
+                        return
             
             elif pattern == "flicker":
                 # Erratic flickering
-                for _ in range(random.randint(5, 15)):
-                    r = random.randint(150, 255)
-                    for ip in ips:
-                        set_color_rgb(ip, r, 0, 0)
-                    time.sleep(random.uniform(0.02, 0.1))
+                for _ in range(randint(5, 15)):
+                    r = randint(150, 255)
+                    set_all_rgb(ips, r, 0, 0)
+                    if _sleep(stop_event, uniform(0.02, 0.1)):
+                        return
                 
     except KeyboardInterrupt:
         print("\nStopping effect.")
@@ -511,58 +565,62 @@ def run_lightning(ips: List[str], stop_event: threading.Event = None, duration=N
     stop_event: threading.Event to signal when to stop
     """
     print("Running lightning mode. Press Enter to stop or change mode.")
-    t0 = time.time()
-    last_lightning = time.time()
+    uniform, randint, choice = random.uniform, random.randint, random.choice
+    t0 = time.monotonic()
+    white, storm = encode_rgb(255, 255, 255), encode_rgb(30, 30, 50)  # flash and after-flash frames
+    flickers = [encode_rgb(level, level, level) for level in range(200, 256)]  # triple-strike flashes
+    last_lightning = time.monotonic()
+    next_tick = time.monotonic()
     
     try:
         while True:
             if stop_event and stop_event.is_set():
                 break
-            if duration and (time.time() - t0) >= duration:
+            if duration and (time.monotonic() - t0) >= duration:
                 break
             
-            now = time.time()
+            now = time.monotonic()
             
             # Random lightning strikes
-            if now - last_lightning > random.uniform(1.0, 5.0):
+            if now - last_lightning > uniform(1.0, 5.0):
                 # Lightning strike!
-                strike_type = random.choice(["single", "double", "triple"])
+                strike_type = choice(("single", "double", "triple"))
                 
                 if strike_type == "single":
-                    for ip in ips:
-                        set_color_rgb(ip, 255, 255, 255)
-                    time.sleep(random.uniform(0.03, 0.08))
-                    for ip in ips:
-                        set_color_rgb(ip, 30, 30, 50)
+                    send_all(ips, white)
+                    if _sleep(stop_event, uniform(0.03, 0.08)):
+                        return
+                    send_all(ips, storm)
                 
                 elif strike_type == "double":
                     for _ in range(2):
-                        for ip in ips:
-                            set_color_rgb(ip, 255, 255, 255)
-                        time.sleep(random.uniform(0.02, 0.05))
-                        for ip in ips:
-                            set_color_rgb(ip, 30, 30, 50)
-                        time.sleep(random.uniform(0.1, 0.2))
+                        send_all(ips, white)
+                        if _sleep(stop_event, uniform(0.02, 0.05)):
+                            return
+                        send_all(ips, storm)
+                        if _sleep(stop_event, uniform(0.1, 0.2)):
+                            return
                 
                 else:  # triple
                     for _ in range(3):
-                        brightness = random.randint(200, 255)
-                        for ip in ips:
-                            set_color_rgb(ip, brightness, brightness, brightness)
-                        time.sleep(random.uniform(0.02, 0.04))
-                        for ip in ips:
-                            set_color_rgb(ip, 30, 30, 50)
-                        time.sleep(random.uniform(0.05, 0.15))
+                        send_all(ips, choice(flickers))
+                        if _sleep(stop_event, uniform(0.02, 0.04)):
+                            return
+                        send_all(ips, storm)
+                        if _sleep(stop_event, uniform(0.05, 0.15)):
+                            return
                 
                 last_lightning = now
+                next_tick = time.monotonic()  # the strike replaces this frame
             else:
                 # Dark stormy sky between lightning
-                r = random.randint(25, 40)
-                g = random.randint(25, 40)
-                b = random.randint(40, 60)
-                for ip in ips:
-                    set_color_rgb(ip, r, g, b)
-                time.sleep(SEND_INTERVAL * 2)
+                r = randint(25, 40)
+                g = randint(25, 40)
+                b = randint(40, 60)
+                set_all_rgb(ips, r, g, b)
+                next_tick = _advance(next_tick, SEND_INTERVAL * 2)
+                if _sleep_until(stop_event, next_tick):
+                    break
                 
     except KeyboardInterrupt:
         print("\nStopping effect.")
@@ -574,37 +632,32 @@ def run_waterfall(ips: List[str], stop_event: threading.Event = None, duration=N
     stop_event: threading.Event to signal when to stop
     """
     print("Running waterfall mode. Press Enter to stop or change mode.")
-    t0 = time.time()
+    lights = [(ip, i * 0.5) for i, ip in enumerate(ips)]  # per-light wave phase
+    sin, rand, randint = math.sin, random.random, random.randint
     
     try:
-        while True:
-            if stop_event and stop_event.is_set():
-                break
-            if duration and (time.time() - t0) >= duration:
-                break
-            
+        for elapsed in _paced(stop_event, SEND_INTERVAL * 0.8, duration):
             # Create flowing water effect
-            for i, ip in enumerate(ips):
-                # Use time and position to create wave effect
-                elapsed = time.time() - t0
-                wave = math.sin(elapsed * 2.0 + i * 0.5) * 0.5 + 0.5
-                
+            t = elapsed * 2.0
+            frame = []
+            for ip, phase in lights:
                 # Mix between deep blue and white
-                if random.random() < 0.15:
+                if rand() < 0.15:
                     # White foam
-                    r = random.randint(200, 255)
-                    g = random.randint(220, 255)
-                    b = random.randint(240, 255)
+                    r = randint(200, 255)
+                    g = randint(220, 255)
+                    b = randint(240, 255)
                 else:
-                    # Blue water with varying intensity
+                    # Blue water with varying intensity; the wave from time and
+                    # position only matters here, so foam skips the sin
+                    wave = sin(t + phase) * 0.5 + 0.5
                     base_blue = int(wave * 100 + 100)
-                    r = random.randint(0, 30)
-                    g = random.randint(40, 100)
-                    b = random.randint(base_blue, min(255, base_blue + 80))
+                    r = randint(0, 30)
+                    g = randint(40, 100)
+                    b = randint(base_blue, min(255, base_blue + 80))
                 
-                set_color_rgb(ip, r, g, b)
-            
-            time.sleep(SEND_INTERVAL * 0.8)
+                frame.append((ip, r, g, b))
+            set_colors_rgb(frame)
             
     except KeyboardInterrupt:
         print("\nStopping effect.")
@@ -616,42 +669,38 @@ def run_fungi(ips: List[str], stop_event: threading.Event = None, duration=None)
     stop_event: threading.Event to signal when to stop
     """
     print("Running fungi mode. Press Enter to stop or change mode.")
-    t0 = time.time()
+    # Per-light wave phases and hue offset, fixed for the whole run
+    lights = [(ip, i * 0.8, i * 1.2, i * 0.5, i * 40) for i, ip in enumerate(ips)]
+    sin, cos, rand, randint = math.sin, math.cos, random.random, random.randint
     
     try:
-        while True:
-            if stop_event and stop_event.is_set():
-                break
-            if duration and (time.time() - t0) >= duration:
-                break
-            
-            elapsed = time.time() - t0
+        for elapsed in _paced(stop_event, SEND_INTERVAL, duration):
+            # Time terms shared by every light this frame
+            t1, t2, t3, drift = elapsed * 1.5, elapsed * 2.3, elapsed * 0.7, elapsed * 30
             
             # Create psychedelic patterns
-            for i, ip in enumerate(ips):
+            frame = []
+            for ip, p1, p2, p3, offset in lights:
                 # Multiple overlapping waves create trippy effect
-                wave1 = math.sin(elapsed * 1.5 + i * 0.8)
-                wave2 = math.cos(elapsed * 2.3 + i * 1.2)
-                wave3 = math.sin(elapsed * 0.7 + i * 0.5)
+                wave1 = sin(t1 + p1)
+                wave2 = cos(t2 + p2)
+                wave3 = sin(t3 + p3)
                 
                 # Map waves to hue (full spectrum)
-                hue = ((wave1 + wave2 + wave3) * 60 + elapsed * 30 + i * 40) % 360
+                hue = ((wave1 + wave2 + wave3) * 60 + drift + offset) % 360
                 
-                # High saturation and varying brightness for psychedelic effect
-                sat = 0.8 + wave1 * 0.2
-                val = 0.6 + wave2 * 0.3
-                
-                r, g, b = hsv_to_rgb_255(hue, max(0.0, min(1.0, sat)), max(0.0, min(1.0, val)))
+                # High saturation and varying brightness for psychedelic effect;
+                # sat stays in [0.6, 1] and val in [0.3, 0.9], so neither needs clamping
+                r, g, b = hsv_to_rgb_255(hue, 0.8 + wave1 * 0.2, 0.6 + wave2 * 0.3)
                 
                 # Add occasional sparkle
-                if random.random() < 0.05:
-                    r = min(255, r + random.randint(50, 100))
-                    g = min(255, g + random.randint(50, 100))
-                    b = min(255, b + random.randint(50, 100))
+                if rand() < 0.05:
+                    r = min(255, r + randint(50, 100))
+                    g = min(255, g + randint(50, 100))
+                    b = min(255, b + randint(50, 100))
                 
-                set_color_rgb(ip, r, g, b)
-            
-            time.sleep(SEND_INTERVAL)
+                frame.append((ip, r, g, b))
+            set_colors_rgb(frame)
             
     except KeyboardInterrupt:
         print("\nStopping effect.")
@@ -1,51 +1,99 @@
 """
 Network discovery and communication for WIZ lights.
 """
+import asyncio
+import ctypes
+import ctypes.util
 import socket
+import sys
 import json
-import concurrent.futures
-from typing import Dict
+import threading
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
+
+# orjson (optional, `uv sync --extra fast`) parses and encodes several times faster
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        # Compact separators, matching orjson's output byte for byte
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
 # WIZ bulb communication constants
 WIZ_PORT = 38899
 PROBE_TIMEOUT = 0.35  # seconds to wait for a single probe response
+# Host numbers never probed in a /24: network address, usual router address, broadcast
+SKIP_HOSTS = frozenset({0, 1, 255})
+TX_SNDBUF = 256 * 1024  # send buffer for effect traffic; holds many full frames
+# Linux <linux/in.h> values; the socket module doesn't export these
+_IP_MTU_DISCOVER = 10
+_IP_PMTUDISC_DONT = 0
 
 # A lightweight query that many WIZ bulbs will answer to
 PROBE_PAYLOAD = {"method": "getPilot", "params": {}}
+_PROBE_BYTES = _dumps(PROBE_PAYLOAD)
 
+# Shared fire-and-forget socket for setPilot traffic, created on first send
+_tx_sock = None
+_tx_lock = threading.Lock()
 
-def probe_ip(ip: str, timeout: float = PROBE_TIMEOUT) -> Dict:
+
+# Linux sendmmsg(2) structures, for sending one frame to every bulb in one syscall
+class _Iovec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _Msghdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_Iovec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _Mmsghdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _Msghdr), ("msg_len", ctypes.c_uint)]
+
+
+class _SockaddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),  # network byte order
+        ("sin_addr", ctypes.c_ubyte * 4),
+        ("sin_zero", ctypes.c_ubyte * 8),
+    ]
+
+
+try:
+    _sendmmsg = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True).sendmmsg
+    _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_Mmsghdr), ctypes.c_uint, ctypes.c_int]
+    _sendmmsg.restype = ctypes.c_int
+except (OSError, AttributeError, TypeError):
+    _sendmmsg = None  # Not Linux; fall back to one sendto per packet
+
+
+def _parse_response(data: bytes) -> Dict:
     """
-    Probe a single IP by sending a JSON UDP request and waiting for a response.
-    Returns parsed JSON dict if a response was received and parsed, otherwise None.
+    Parse a bulb's UDP reply into a dict.
+    Falls back to {"_raw": ...} if the reply is not valid JSON.
     """
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    # Bind to an ephemeral port so we can receive the reply on the same socket
     try:
-        s.bind(("", 0))
-    except Exception:
+        # Compliant replies are bare JSON; parse the bytes as they are
+        return _loads(data)
+    except ValueError:
         pass
-    s.settimeout(timeout)
-    try:
-        s.sendto(json.dumps(PROBE_PAYLOAD).encode("utf-8"), (ip, WIZ_PORT))
-        data, addr = s.recvfrom(4096)
-    except socket.timeout:
-        return None
-    except Exception:
-        return None
-    finally:
-        try:
-            s.close()
-        except Exception:
-            pass
-
     try:
-        dec = data.decode("utf-8", errors="ignore")
-        idx = dec.find("{")
-        if idx != -1:
-            dec = dec[idx:]
-        obj = json.loads(dec)
-        return obj
+        # Otherwise skip any leading junk before the object
+        idx = data.find(b"{")
+        return _loads(data[idx:] if idx > 0 else data)
     except Exception:
         # return raw string if parsing failed
         try:
@@ -54,53 +102,331 @@ def probe_ip(ip: str, timeout: float = PROBE_TIMEOUT) -> Dict:
             return {"_raw": "<binary>"}
 
 
-def scan_ip_range(base_ip: str = "192.168.1", start: int = 0, end: int = 255, workers: int = 60) -> Dict[str, dict]:
+def probe_ip(ip: str, timeout: float = PROBE_TIMEOUT) -> Dict:
+    """
+    Probe a single IP by sending a JSON UDP request and waiting for a response.
+    Returns parsed JSON dict if a response was received and parsed, otherwise None.
+    """
+    # Needs its own socket to read the reply; sendto binds it to an ephemeral port
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.settimeout(timeout)
+        try:
+            s.sendto(_PROBE_BYTES, _addr(ip))
+            data, addr = s.recvfrom(4096)
+        except OSError:  # includes socket.timeout
+            return None
+
+    return _parse_response(data)
+
+
+class _ProbeProtocol(asyncio.DatagramProtocol):
+    """Probes the scanned IPs from a single UDP socket and collects their replies."""
+
+    def __init__(self, ips: List[str]):
+        self.ips = ips
+        self.targets = set(ips)
+        self.discovered: Dict[str, dict] = {}
+        self.all_answered = asyncio.Event()
+
+    def connection_made(self, transport) -> None:
+        # Blast every probe back-to-back as soon as the socket exists. Most
+        # scanned hosts aren't bulbs, so their addresses skip the _addr cache
+        for ip in self.ips:
+            transport.sendto(_PROBE_BYTES, (ip, WIZ_PORT))
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        ip = addr[0]
+        if ip in self.targets:
+            res = _parse_response(data)
+            if res:
+                self.discovered[ip] = res
+                if len(self.discovered) == len(self.targets):
+                    self.all_answered.set()
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP errors (unreachable hosts, the broadcast address) are expected
+        pass
+
+
+async def _scan(ips: List[str], timeout: float) -> Dict[str, dict]:
+    """
+    Send one probe to every IP from one socket, then collect replies until
+    timeout, or until every IP has answered.
+    """
+    if not ips:
+        return {}
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: _ProbeProtocol(ips), local_addr=("0.0.0.0", 0)
+    )
+    try:
+        await asyncio.wait_for(protocol.all_answered.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        transport.close()
+    return protocol.discovered
+
+
+def _own_ip(prefix: str) -> str:
+    """
+    This host's address on the scanned network, or "" if it can't be found.
+    Connecting a UDP socket only picks the outgoing interface; nothing is sent.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        try:
+            s.connect((f"{prefix}1", WIZ_PORT))
+            return s.getsockname()[0]
+        except OSError:
+            return ""
+
+
+@lru_cache(maxsize=8)
+def _range_ips(prefix: str, start: int, end: int) -> Tuple[Tuple[int, str], ...]:
+    """(host number, address) pairs for a scan range, formatted once per range."""
+    return tuple((i, f"{prefix}{i}") for i in range(start, end + 1))
+
+
+def scan_ip_range(base_ip: str = "192.168.1", start: int = 0, end: int = 255,
+                  exclude_ips: Set[str] = frozenset(), skip_hosts: Set[int] = SKIP_HOSTS) -> Dict[str, dict]:
     """
     Scan the IPv4 range base_ip.start .. base_ip.end (inclusive) by probing each IP.
     Returns a dict mapping IP -> response dict for each responsive device.
     
+    All probes go out back-to-back from a single UDP socket on an asyncio
+    event loop, so the whole range is scanned in one PROBE_TIMEOUT window.
+    
     Args:
         base_ip: Base IP address (e.g., "192.168.1" for 192.168.1.0-255)
         start: Starting host number
         end: Ending host number (inclusive)
-        workers: Number of concurrent threads for scanning
+        exclude_ips: Addresses known not to be bulbs; they are not probed
+        skip_hosts: Host numbers to leave out (network, router and broadcast by default)
+    
+    This host's own address is never probed either.
     """
     prefix = base_ip + "." if not base_ip.endswith(".") else base_ip
-    ips = [f"{prefix}{i}" for i in range(start, end + 1)]
-    discovered: Dict[str, dict] = {}
-
-    # Use a thread pool to probe multiple addresses concurrently to speed up scanning
-    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
-        future_map = {ex.submit(probe_ip, ip): ip for ip in ips}
-        for fut in concurrent.futures.as_completed(future_map):
-            ip = future_map[fut]
-            try:
-                res = fut.result()
-            except Exception:
-                res = None
-            if res:
-                discovered[ip] = res
-    return discovered
+    own_ip = _own_ip(prefix)
+    ips = [
+        ip for i, ip in _range_ips(prefix, start, end)
+        if i not in skip_hosts and ip not in exclude_ips and ip != own_ip
+    ]
+    return asyncio.run(_scan(ips, PROBE_TIMEOUT))
+
+
+@lru_cache(maxsize=None)
+def _addr(ip: str) -> Tuple[str, int]:
+    """Destination tuple for a bulb, built once per IP instead of per packet."""
+    return (ip, WIZ_PORT)
+
+
+@lru_cache(maxsize=None)
+def _sockaddr(ip: str) -> _SockaddrIn:
+    """Packed sockaddr_in for a bulb, built once per IP for sendmmsg."""
+    addr = _SockaddrIn()
+    addr.sin_family = socket.AF_INET
+    addr.sin_port = socket.htons(WIZ_PORT)
+    addr.sin_addr[:] = socket.inet_aton(ip)
+    return addr
+
+
+_SOCKADDR_LEN = ctypes.sizeof(_SockaddrIn)
+
+
+@lru_cache(maxsize=None)
+def _sockaddr_ptr(ip: str) -> int:
+    """Address of the bulb's cached sockaddr_in, ready to drop into a msghdr."""
+    return ctypes.addressof(_sockaddr(ip))
+
+
+def _get_tx_socket() -> socket.socket:
+    """
+    Return the module's shared UDP send socket, creating it on first use.
+    Non-blocking: if the send buffer is ever full the packet is dropped
+    rather than stalling an effect loop. The enlarged send buffer makes that
+    unlikely even during strobe bursts. Python creates the socket close-on-exec.
+    """
+    global _tx_sock
+    if _tx_sock is None:
+        with _tx_lock:
+            if _tx_sock is None:
+                if hasattr(socket, "SOCK_NONBLOCK"):
+                    # Linux: non-blocking from creation, no extra ioctl
+                    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM | socket.SOCK_NONBLOCK)
+                else:
+                    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                    s.setblocking(False)
+                try:
+                    s.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, TX_SNDBUF)
+                    # Bulb acks to setPilot are never read; don't let them pin memory
+                    s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1)
+                except OSError:
+                    pass  # keep the default buffers
+                if sys.platform.startswith("linux"):
+                    # setPilot packets are far below any MTU; skip path MTU
+                    # discovery so sends never wait on or react to it
+                    try:
+                        s.setsockopt(socket.IPPROTO_IP, _IP_MTU_DISCOVER, _IP_PMTUDISC_DONT)
+                    except OSError:
+                        pass
+                _tx_sock = s
+    return _tx_sock
 
 
 def send_udp(ip: str, payload: dict) -> None:
     """
     Send a JSON payload to a device IP over UDP (WIZ uses 38899).
     Fire-and-forget; some devices don't reply to setPilot, so we don't wait here.
+    All sends share one socket; sendto on a datagram socket is safe to call
+    from several effect threads at once.
     """
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    s.settimeout(0.5)
     try:
-        s.sendto(json.dumps(payload).encode("utf-8"), (ip, WIZ_PORT))
-    except Exception:
+        _get_tx_socket().sendto(_dumps(payload), _addr(ip))
+    except OSError:
         pass
-    finally:
+
+
+# ASCII digits for 0-255, so building a setPilot packet needs no number formatting
+_DIGITS = {i: b"%d" % i for i in range(256)}
+
+
+@lru_cache(maxsize=4096)
+def _pilot_bytes(r: int, g: int, b: int, transition: int, dimming: int) -> bytes:
+    """
+    Encoded setPilot request for one color. Effects revisit the same few hundred
+    colors, so the encoded packets are cached instead of rebuilt per send.
+    """
+    try:
+        return b"".join((
+            b'{"method":"setPilot","params":{"r":', _DIGITS[r], b',"g":', _DIGITS[g],
+            b',"b":', _DIGITS[b], b',"transition":', _DIGITS[transition],
+            b',"dimming":', _DIGITS[dimming], b"}}",
+        ))
+    except KeyError:
+        # Out-of-range or non-int values (e.g. long transitions) take the slow path
+        return (
+            b'{"method":"setPilot","params":{"r":%d,"g":%d,"b":%d,"transition":%d,"dimming":%d}}'
+            % (r, g, b, transition, dimming)
+        )
+
+
+@lru_cache(maxsize=8)
+def _batch_headers(ips: Tuple[str, ...]):
+    """
+    Prebuilt sendmmsg headers for a frame addressed to ips, each pointing at
+    its own iovec. Returns (iovecs, headers, lock); a frame only refills the
+    iovecs, under the lock.
+    """
+    n = len(ips)
+    iovs = (_Iovec * n)()
+    msgs = (_Mmsghdr * n)()
+    for i, ip in enumerate(ips):
+        hdr = msgs[i].msg_hdr
+        hdr.msg_name = _sockaddr_ptr(ip)
+        hdr.msg_namelen = _SOCKADDR_LEN
+        hdr.msg_iov = ctypes.pointer(iovs[i])
+        hdr.msg_iovlen = 1
+    return iovs, msgs, threading.Lock()
+
+
+def _send_batch(sock: socket.socket, packets: List[Tuple[bytes, str]]) -> None:
+    """
+    Send (data, ip) datagrams to WIZ_PORT, in one sendmmsg call where available.
+    Anything sendmmsg didn't take (or every packet, without it) goes out with sendto.
+    """
+    n = len(packets)
+    sent = 0
+    if _sendmmsg is not None and n > 1:
         try:
-            s.close()
-        except Exception:
+            iovs, msgs, lock = _batch_headers(tuple([ip for _, ip in packets]))
+        except OSError:
+            pass  # e.g. a hostname rather than a dotted IPv4 address
+        else:
+            with lock:
+                for iov, (data, _) in zip(iovs, packets):
+                    iov.iov_base = ctypes.cast(data, ctypes.c_void_p)
+                    iov.iov_len = len(data)
+                sent = max(0, _sendmmsg(sock.fileno(), msgs, n, 0))
+    for data, ip in packets[sent:]:
+        try:
+            sock.sendto(data, _addr(ip))
+        except OSError:
             pass
 
 
+@lru_cache(maxsize=8)
+def _fanout_headers(ips: Tuple[str, ...]):
+    """
+    Prebuilt sendmmsg headers addressing every IP in ips, all pointing at one
+    shared iovec. Returns (iovec, headers, lock); the lock guards refilling
+    the iovec for a send.
+    """
+    iov = _Iovec()
+    msgs = (_Mmsghdr * len(ips))()
+    iov_ptr = ctypes.pointer(iov)
+    for i, ip in enumerate(ips):
+        hdr = msgs[i].msg_hdr
+        hdr.msg_name = _sockaddr_ptr(ip)
+        hdr.msg_namelen = _SOCKADDR_LEN
+        hdr.msg_iov = iov_ptr
+        hdr.msg_iovlen = 1
+    return iov, msgs, threading.Lock()
+
+
+def _send_same(sock: socket.socket, data: bytes, ips: List[str]) -> None:
+    """
+    Send one datagram to every IP. With sendmmsg the per-selection headers
+    are reused from frame to frame, so a frame only repoints the shared iovec.
+    """
+    if _sendmmsg is not None and len(ips) > 1:
+        try:
+            iov, msgs, lock = _fanout_headers(tuple(ips))
+        except OSError:
+            pass  # e.g. a hostname rather than a dotted IPv4 address
+        else:
+            with lock:
+                iov.iov_base = ctypes.cast(data, ctypes.c_void_p)
+                iov.iov_len = len(data)
+                sent = _sendmmsg(sock.fileno(), msgs, len(ips), 0)
+            if sent == len(ips):
+                return
+            ips = ips[max(0, sent):]
+    _send_batch(sock, [(data, ip) for ip in ips])
+
+
+def set_colors_rgb(colors: List[Tuple[str, int, int, int]], transition: int = 0, dimming: int = 100) -> None:
+    """
+    Send one frame to several lights at once.
+    colors is a list of (ip, r, g, b) tuples with RGB values 0-255.
+    """
+    _send_batch(
+        _get_tx_socket(),
+        [(_pilot_bytes(r, g, b, transition, dimming), ip) for ip, r, g, b in colors],
+    )
+
+
+def set_all_rgb(ips: List[str], r: int, g: int, b: int, transition: int = 0, dimming: int = 100) -> None:
+    """
+    Send the same color to every light in ips, encoding the packet only once.
+    """
+    _send_same(_get_tx_socket(), _pilot_bytes(r, g, b, transition, dimming), ips)
+
+
+def encode_rgb(r: int, g: int, b: int, transition: int = 0, dimming: int = 100) -> bytes:
+    """
+    Encoded setPilot packet for a color, for effects that precompute their frames.
+    Send it with send_all.
+    """
+    return _pilot_bytes(r, g, b, transition, dimming)
+
+
+def send_all(ips: List[str], packet: bytes) -> None:
+    """
+    Send a packet from encode_rgb to every light in ips.
+    """
+    _send_same(_get_tx_socket(), packet, ips)
+
+
 def set_color_rgb(ip: str, r: int, g: int, b: int, transition: int = 0, dimming: int = 100) -> None:
     """
     Tell a WIZ light to set color using RGB values (0-255).
@@ -108,5 +434,7 @@ def set_color_rgb(ip: str, r: int, g: int, b: int, transition: int = 0, dimming:
     transition is transition time in milliseconds (device dependent).
     dimming is brightness level 0-100 (0 = off, 100 = full brightness).
     """
-    payload = {"method": "setPilot", "params": {"r": r, "g": g, "b": b, "transition": transition, "dimming": dimming}}
-    send_udp(ip, payload)
+    try:
+        _get_tx_socket().sendto(_pilot_bytes(r, g, b, transition, dimming), _addr(ip))
+    except OSError:
+        pass
@@ -5,8 +5,119 @@ Includes menu display, TUI, and user interaction functions.
 """
 import sys
 from typing import Dict, List, Tuple
-from .colors import kelvin_to_rgb_255
 
+# curses drives the arrow-key menu; it is missing on Windows and some minimal builds
+_curses = None
+if sys.platform != 'win32':
+    try:
+        import curses as _curses
+    except ImportError:
+        _curses = None
+
+
+# All controls shown in the menus, grouped by category
+_CONTROLS = [
+    ("🌈 RAINBOW CONTROLS", [
+        ("rainbow_in_unison", "all lights cycle colors together"),
+        ("rainbow", "lights cycle colors with offsets"),
+        ("party", "random colorful flashing"),
+        ("fungi", "psychedelic funky animation"),
+    ]),
+    ("🎃 THEMED CONTROLS", [
+        ("spooky", "Halloween orange/purple flickers"),
+        ("seasonal", "colors based on current season"),
+        ("danger", "scary red strobe alarm"),
+    ]),
+    ("⛈️  NATURE CONTROLS", [
+        ("lightning", "stormy skies with lightning"),
+        ("waterfall", "flowing blues and white"),
+    ]),
+    ("🎵 INTERACTIVE", [
+        ("reactive", "responds to microphone audio"),
+        ("synth", "flash colors with number keys"),
+    ]),
+    ("⚙️  UTILITIES", [
+        ("white", "set to white color temperature"),
+        ("rgba", "set custom RGBA color"),
+    ]),
+    ("📋 OPTIONS", [
+        ("change_bulbs", "select different bulbs"),
+        ("rescan", "scan network for new bulbs"),
+    ]),
+]
+
+# Flattened (name, description, category) rows for menu navigation
+_FLAT_CONTROLS = tuple(
+    (name, desc, category) for category, items in _CONTROLS for name, desc in items
+)
+
+# Separator bar for the 60-column text menus
+_BAR60 = "=" * 60
+
+# Text menu printed by choose_effect, built once from _CONTROLS
+_MENU_TEXT = "\n".join(
+    ["", _BAR60, "AVAILABLE CONTROLS".center(60), _BAR60]
+    + [
+        line
+        for category, items in _CONTROLS
+        for line in ["", f"{category}:"] + [f"  {name:<17} - {desc}" for name, desc in items]
+    ]
+    + ["", _BAR60, "Type 'tui' for interactive menu or enter control name", ""]
+)
+
+
+# Names accepted by choose_effect, in the order used to break prefix ties
+_EFFECT_NAMES = (
+    "rainbow_in_unison", "rainbow", "spooky", "white", "rgba", "party", "synth",
+    "reactive", "seasonal", "danger", "lightning", "waterfall", "fungi",
+    "change_bulbs", "rescan",
+)
+_EFFECTS = frozenset(_EFFECT_NAMES)
+
+
+def _build_prefix_index(names) -> Dict[str, List[str]]:
+    """Map every prefix of every name to the names it could complete to."""
+    index: Dict[str, List[str]] = {}
+    for name in names:
+        for end in range(1, len(name) + 1):
+            index.setdefault(name[:end], []).append(name)
+    return index
+
+_PREFIX_INDEX = _build_prefix_index(_EFFECT_NAMES)
+
+
+def _extract_name(descr: dict) -> str:
+    """
+    Get a display name from a bulb's cached getPilot response.
+    Returns an empty string if the response carries no name.
+    """
+    if not isinstance(descr, dict):
+        return ""
+    res = descr.get("result")
+    if isinstance(res, dict):
+        return res.get("deviceName") or res.get("moduleName") or res.get("name") or res.get("alias") or ""
+    return descr.get("deviceName") or descr.get("moduleName") or ""
+
+def _format_lights(lights: List[str], info: Dict[str, dict]) -> str:
+    """
+    Render the numbered "[i] ip - name" list as one newline-terminated block.
+    """
+    lines = []
+    for i, ip in enumerate(lights):
+        name = _extract_name(info.get(ip, {}))
+        lines.append(f"  [{i}] {ip} - {name}\n" if name else f"  [{i}] {ip}\n")
+    return "".join(lines)
+
+def _pick_indices(lights: List[str], sel: str) -> List[str]:
+    """
+    Return the lights named by a comma-separated index list, ignoring bad entries.
+    """
+    count = len(lights)
+    return [
+        lights[idx]
+        for idx in (int(chunk) for chunk in map(str.strip, sel.split(",")) if chunk.isdecimal())
+        if idx < count
+    ]
 
 def prompt_user_selection(lights: List[str], info: Dict[str, dict]) -> List[str]:
     """
@@ -17,37 +128,13 @@ def prompt_user_selection(lights: List[str], info: Dict[str, dict]) -> List[str]
         print("No devices discovered.")
         return []
     
-    print("\nDiscovered WIZ lights:")
-    for i, ip in enumerate(lights):
-        descr = info.get(ip, {})
-        pretty = ip
-        name = ""
-        if isinstance(descr, dict):
-            if "result" in descr and isinstance(descr["result"], dict):
-                res = descr["result"]
-                name = res.get("deviceName") or res.get("moduleName") or res.get("name") or res.get("alias") or ""
-            else:
-                name = descr.get("deviceName") or descr.get("moduleName") or ""
-        if name:
-            pretty += f" - {name}"
-        print(f"  [{i}] {pretty}")
+    sys.stdout.write("\nDiscovered WIZ lights:\n" + _format_lights(lights, info))
 
     print(f"\n{len(lights)} light(s) found. Default: use all lights.")
     sel = input("Enter comma-separated indices to select specific lights, or press Enter for all [all]: ").strip()
     if sel.lower() in ("", "a", "all"):
         return lights
-    chosen = []
-    for chunk in sel.split(","):
-        chunk = chunk.strip()
-        if not chunk:
-            continue
-        try:
-            idx = int(chunk)
-            if 0 <= idx < len(lights):
-                chosen.append(lights[idx])
-        except ValueError:
-            pass
-    return chosen
+    return _pick_indices(lights, sel)
 
 def change_bulb_selection(lights: List[str], info: Dict[str, dict], current: List[str]) -> List[str]:
     """
@@ -57,47 +144,17 @@ def change_bulb_selection(lights: List[str], info: Dict[str, dict], current: Lis
     print("\n=== Change Bulb Selection ===")
     print(f"Currently selected: {len(current)} bulb(s)")
     for ip in current:
-        descr = info.get(ip, {})
-        name = ""
-        if isinstance(descr, dict):
-            if "result" in descr and isinstance(descr["result"], dict):
-                res = descr["result"]
-                name = res.get("deviceName") or res.get("moduleName") or res.get("name") or res.get("alias") or ""
-            else:
-                name = descr.get("deviceName") or descr.get("moduleName") or ""
+        name = _extract_name(info.get(ip, {}))
         print(f"  - {ip}" + (f" ({name})" if name else ""))
     
-    print("\nAvailable lights:")
-    for i, ip in enumerate(lights):
-        descr = info.get(ip, {})
-        pretty = ip
-        name = ""
-        if isinstance(descr, dict):
-            if "result" in descr and isinstance(descr["result"], dict):
-                res = descr["result"]
-                name = res.get("deviceName") or res.get("moduleName") or res.get("name") or res.get("alias") or ""
-            else:
-                name = descr.get("deviceName") or descr.get("moduleName") or ""
-        if name:
-            pretty += f" - {name}"
-        print(f"  [{i}] {pretty}")
+    sys.stdout.write("\nAvailable lights:\n" + _format_lights(lights, info))
     
     sel = input("\nEnter comma-separated indices (or 'a' for all, Enter to keep current): ").strip()
     if not sel:
         return current
     if sel.lower() in ("a", "all"):
         return lights
-    chosen = []
-    for chunk in sel.split(","):
-        chunk = chunk.strip()
-        if not chunk:
-            continue
-        try:
-            idx = int(chunk)
-            if 0 <= idx < len(lights):
-                chosen.append(lights[idx])
-        except ValueError:
-            pass
+    chosen = _pick_indices(lights, sel)
     return chosen if chosen else current
 
 def choose_effect_tui() -> str:
@@ -105,67 +162,45 @@ def choose_effect_tui() -> str:
     Interactive TUI for selecting controls using arrow keys.
     Falls back to simple input on Windows or if curses unavailable.
     """
-    # Define all controls with categories
-    controls = [
-        ("🌈 RAINBOW CONTROLS", [
-            ("rainbow_in_unison", "all lights cycle colors together"),
-            ("rainbow", "lights cycle colors with offsets"),
-            ("party", "random colorful flashing"),
-            ("fungi", "psychedelic funky animation"),
-        ]),
-        ("🎃 THEMED CONTROLS", [
-            ("spooky", "Halloween orange/purple flickers"),
-            ("seasonal", "colors based on current season"),
-            ("danger", "scary red strobe alarm"),
-        ]),
-        ("⛈️  NATURE CONTROLS", [
-            ("lightning", "stormy skies with lightning"),
-            ("waterfall", "flowing blues and white"),
-        ]),
-        ("🎵 INTERACTIVE", [
-            ("reactive", "responds to microphone audio"),
-            ("synth", "flash colors with number keys"),
-        ]),
-        ("⚙️  UTILITIES", [
-            ("white", "set to white color temperature"),
-            ("rgba", "set custom RGBA color"),
-        ]),
-        ("📋 OPTIONS", [
-            ("change_bulbs", "select different bulbs"),
-            ("rescan", "scan network for new bulbs"),
-        ]),
-    ]
-    
-    # Flatten controls list for navigation
-    flat_controls = []
-    for category, items in controls:
-        for name, desc in items:
-            flat_controls.append((name, desc, category))
-    
     # Try to use curses for interactive selection
-    if sys.platform != 'win32':
+    if _curses is not None:
         try:
-            import curses
+            def draw_item(stdscr, row, idx, selected, width):
+                # One write per row; highlight the selected item
+                name, desc, _ = _FLAT_CONTROLS[idx]
+                if selected:
+                    stdscr.addnstr(row, 2, f"→ {name} - {desc}", width - 3, _curses.A_REVERSE)
+                else:
+                    stdscr.addnstr(row, 2, f"  {name} - {desc}", width - 3)
+            
+            title = "INTERACTIVE CONTROL SELECTOR"
+            instructions = "Use ↑/↓ arrows to navigate, Enter to select, 'q' to cancel"
             
-            def draw_menu(stdscr, selected_idx):
-                stdscr.clear()
+            def measure(stdscr):
+                # Terminal size and the centring derived from it only change on resize
                 height, width = stdscr.getmaxyx()
+                return (height, width, (width - len(title)) // 2,
+                        (width - len(instructions)) // 2, "=" * width)
+            
+            def draw_menu(stdscr, selected_idx, dims):
+                """Repaint the whole menu; returns {item index: screen row} for visible items."""
+                height, width, title_x, instr_x, sep = dims
+                stdscr.erase()
                 
                 # Title
-                title = "INTERACTIVE CONTROL SELECTOR"
-                stdscr.addstr(0, (width - len(title)) // 2, title, curses.A_BOLD)
-                stdscr.addstr(1, 0, "="*width)
+                stdscr.addstr(0, title_x, title, _curses.A_BOLD)
+                stdscr.addstr(1, 0, sep)
                 
                 # Instructions
-                instructions = "Use ↑/↓ arrows to navigate, Enter to select, 'q' to cancel"
-                stdscr.addstr(2, (width - len(instructions)) // 2, instructions)
-                stdscr.addstr(3, 0, "="*width)
+                stdscr.addstr(2, instr_x, instructions)
+                stdscr.addstr(3, 0, sep)
                 
                 # Display controls
                 current_category = None
                 row = 4
+                item_rows = {}
                 
-                for idx, (name, desc, category) in enumerate(flat_controls):
+                for idx, (name, desc, category) in enumerate(_FLAT_CONTROLS):
                     if row >= height - 2:
                         break
                     
@@ -179,62 +214,78 @@ def choose_effect_tui() -> str:
                     if row >= height - 2:
                         break
                     
-                    # Highlight selected item
-                    if idx == selected_idx:
-                        stdscr.addstr(row, 2, f"→ {name}", curses.A_REVERSE)
-                        stdscr.addstr(row, 4 + len(name), f" - {desc}", curses.A_REVERSE)
-                    else:
-                        stdscr.addstr(row, 2, f"  {name}")
-                        stdscr.addstr(row, 4 + len(name), f" - {desc}")
-                    
+                    draw_item(stdscr, row, idx, idx == selected_idx, width)
+                    item_rows[idx] = row
                     row += 1
                 
-                stdscr.refresh()
+                # Stage only; the caller flushes with a single doupdate
+                stdscr.noutrefresh()
+                return item_rows
             
             def select_with_curses(stdscr):
-                curses.curs_set(0)  # Hide cursor
+                # Session-level terminal state is set once here; _curses.wrapper
+                # has already enabled keypad mode and cbreak
+                try:
+                    _curses.curs_set(0)  # Hide cursor
+                except _curses.error:
+                    pass  # Terminal can't hide the cursor
                 selected_idx = 0
+                dims = measure(stdscr)
+                item_rows = draw_menu(stdscr, selected_idx, dims)
+                _curses.doupdate()
                 
                 while True:
-                    draw_menu(stdscr, selected_idx)
                     key = stdscr.getch()
+                    prev_idx = selected_idx
                     
-                    if key == curses.KEY_UP and selected_idx > 0:
+                    if key == _curses.KEY_UP and selected_idx > 0:
                         selected_idx -= 1
-                    elif key == curses.KEY_DOWN and selected_idx < len(flat_controls) - 1:
+                    elif key == _curses.KEY_DOWN and selected_idx < len(_FLAT_CONTROLS) - 1:
                         selected_idx += 1
-                    elif key == ord('\n') or key == curses.KEY_ENTER:
-                        return flat_controls[selected_idx][0]
+                    elif key == ord('\n') or key == _curses.KEY_ENTER:
+                        return _FLAT_CONTROLS[selected_idx][0]
                     elif key == ord('q') or key == ord('Q'):
                         return "rainbow_in_unison"  # Default
+                    elif key == _curses.KEY_RESIZE:
+                        dims = measure(stdscr)
+                        stdscr.clear()  # Full repaint only after a resize
+                        item_rows = draw_menu(stdscr, selected_idx, dims)
+                        _curses.doupdate()
+                        continue
+                    
+                    # Only the old and new highlighted rows change
+                    if selected_idx != prev_idx:
+                        for idx in (prev_idx, selected_idx):
+                            if idx in item_rows:
+                                draw_item(stdscr, item_rows[idx], idx, idx == selected_idx, dims[1])
+                        stdscr.noutrefresh()
+                        _curses.doupdate()
             
-            result = curses.wrapper(select_with_curses)
+            result = _curses.wrapper(select_with_curses)
             return result
             
         except Exception as e:
             print(f"TUI unavailable ({e}), using numbered menu...")
     
     # Fallback to numbered menu
-    print("\n" + "="*60)
-    print("INTERACTIVE CONTROL SELECTOR".center(60))
-    print("="*60)
-    
-    for idx, (name, desc, category) in enumerate(flat_controls):
-        print(f"  {idx+1:2d}) {name:20s} - {desc}")
-    
-    print("\n" + "="*60)
+    lines = ["", _BAR60, "INTERACTIVE CONTROL SELECTOR".center(60), _BAR60]
+    lines += [f"  {idx+1:2d}) {name:20s} - {desc}" for idx, (name, desc, _) in enumerate(_FLAT_CONTROLS)]
+    lines += ["", _BAR60, ""]
+    # One write call: a line-buffered console then flushes once, not per line
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
     
     while True:
         try:
-            choice = input(f"Select control (1-{len(flat_controls)}) [1]: ").strip()
+            choice = input(f"Select control (1-{len(_FLAT_CONTROLS)}) [1]: ").strip()
             if not choice:
-                return flat_controls[0][0]
+                return _FLAT_CONTROLS[0][0]
             
             idx = int(choice) - 1
-            if 0 <= idx < len(flat_controls):
-                return flat_controls[idx][0]
+            if 0 <= idx < len(_FLAT_CONTROLS):
+                return _FLAT_CONTROLS[idx][0]
             else:
-                print(f"Please enter a number between 1 and {len(flat_controls)}")
+                print(f"Please enter a number between 1 and {len(_FLAT_CONTROLS)}")
         except ValueError:
             print("Please enter a valid number")
         except (EOFError, KeyboardInterrupt):
@@ -245,39 +296,8 @@ def choose_effect() -> str:
     Display available controls menu and get user choice.
     Now organized by category for better usability.
     """
-    print("\n" + "="*60)
-    print("AVAILABLE CONTROLS".center(60))
-    print("="*60)
-    
-    print("\n🌈 RAINBOW CONTROLS:")
-    print("  rainbow_in_unison - all lights cycle colors together")
-    print("  rainbow           - lights cycle colors with offsets")
-    print("  party             - random colorful flashing")
-    print("  fungi             - psychedelic funky animation")
-    
-    print("\n🎃 THEMED CONTROLS:")
-    print("  spooky            - Halloween orange/purple flickers")
-    print("  seasonal          - colors based on current season")
-    print("  danger            - scary red strobe alarm")
-    
-    print("\n⛈️  NATURE CONTROLS:")
-    print("  lightning         - stormy skies with lightning")
-    print("  waterfall         - flowing blues and white")
-    
-    print("\n🎵 INTERACTIVE:")
-    print("  reactive          - responds to microphone audio")
-    print("  synth             - flash colors with number keys")
-    
-    print("\n⚙️  UTILITIES:")
-    print("  white             - set to white color temperature")
-    print("  rgba              - set custom RGBA color")
-    
-    print("\n📋 OPTIONS:")
-    print("  change_bulbs      - select different bulbs")
-    print("  rescan            - scan network for new bulbs")
-    
-    print("\n" + "="*60)
-    print("Type 'tui' for interactive menu or enter control name")
+    sys.stdout.write(_MENU_TEXT)
+    sys.stdout.flush()
     
     choice = input("Choose control [rainbow_in_unison]: ").strip().lower()
     
@@ -285,35 +305,16 @@ def choose_effect() -> str:
     if choice == "tui":
         return choose_effect_tui()
     
-    # Map choices to effect names
-    effect_map = {
-        "rainbow_in_unison": "rainbow_in_unison",
-        "rainbow": "rainbow",
-        "spooky": "spooky",
-        "white": "white",
-        "rgba": "rgba",
-        "party": "party",
-        "synth": "synth",
-        "reactive": "reactive",
-        "seasonal": "seasonal",
-        "danger": "danger",
-        "lightning": "lightning",
-        "waterfall": "waterfall",
-        "fungi": "fungi",
-        "change_bulbs": "change_bulbs",
-        "rescan": "rescan",
-    }
-    
     # Allow partial matches for convenience
     if not choice:
         return "rainbow_in_unison"
     
     # Try exact match first
-    if choice in effect_map:
-        return effect_map[choice]
+    if choice in _EFFECTS:
+        return choice
     
     # Try prefix matching
-    matches = [name for name in effect_map.keys() if name.startswith(choice)]
+    matches = _PREFIX_INDEX.get(choice, [])
     if len(matches) == 1:
         return matches[0]
     elif len(matches) > 1:
@@ -326,283 +327,40 @@ def choose_effect() -> str:
     print(f"Unknown effect: '{choice}'. Using default (rainbow_in_unison).")
     return "rainbow_in_unison"
 
-def get_kelvin_temperature() -> int:
+def _prompt_int(prompt: str, default: int, lo: int, hi: int, unit: str = "") -> int:
     """
-    Prompt user to enter a color temperature in Kelvin with guidance.
-    Returns the validated temperature value.
+    Prompt until the user enters an integer in [lo, hi]; empty input returns default.
     """
-    print("\nEnter desired white temperature in Kelvin.")
-    print("Common values:")
-    print("  2700K - Warm white (incandescent bulb, cozy/relaxing)")
-    print("  3000K - Soft white (warm, inviting)")
-    print("  4000K - Neutral white (balanced, natural)")
-    print("  5000K - Cool white (bright, energetic)")
-    print("  6500K - Daylight (very bright, blue-ish)")
-    
     while True:
+        text = input(prompt).strip()
+        if not text:
+            return default
         try:
-            temp_str = input("Enter temperature in Kelvin [4000]: ").strip()
-            if not temp_str:
-                return 4000
-            temp = int(temp_str)
-            if temp < 1000 or temp > 10000:
-                print("Please enter a value between 1000K and 10000K.")
-                continue
-            return temp
+            value = int(text)
         except ValueError:
             print("Invalid input. Please enter a number.")
+            continue
+        if lo <= value <= hi:
+            return value
+        print(f"Please enter a value between {lo}{unit} and {hi}{unit}.")
 
-def choose_effect_tui() -> str:
-    """
-    Interactive TUI for selecting controls using arrow keys.
-    Falls back to simple input on Windows or if curses unavailable.
-    """
-    # Define all controls with categories
-    controls = [
-        ("🌈 RAINBOW CONTROLS", [
-            ("rainbow_in_unison", "all lights cycle colors together"),
-            ("rainbow", "lights cycle colors with offsets"),
-            ("party", "random colorful flashing"),
-            ("fungi", "psychedelic funky animation"),
-        ]),
-        ("🎃 THEMED CONTROLS", [
-            ("spooky", "Halloween orange/purple flickers"),
-            ("seasonal", "colors based on current season"),
-            ("danger", "scary red strobe alarm"),
-        ]),
-        ("⛈️  NATURE CONTROLS", [
-            ("lightning", "stormy skies with lightning"),
-            ("waterfall", "flowing blues and white"),
-        ]),
-        ("🎵 INTERACTIVE", [
-            ("reactive", "responds to microphone audio"),
-            ("synth", "flash colors with number keys"),
-        ]),
-        ("⚙️  UTILITIES", [
-            ("white", "set to white color temperature"),
-            ("rgba", "set custom RGBA color"),
-        ]),
-        ("📋 OPTIONS", [
-            ("change_bulbs", "select different bulbs"),
-            ("rescan", "scan network for new bulbs"),
-        ]),
-    ]
-    
-    # Flatten controls list for navigation
-    flat_controls = []
-    for category, items in controls:
-        for name, desc in items:
-            flat_controls.append((name, desc, category))
-    
-    # Try to use curses for interactive selection
-    if sys.platform != 'win32':
-        try:
-            import curses
-            
-            def draw_menu(stdscr, selected_idx):
-                stdscr.clear()
-                height, width = stdscr.getmaxyx()
-                
-                # Title
-                title = "INTERACTIVE CONTROL SELECTOR"
-                stdscr.addstr(0, (width - len(title)) // 2, title, curses.A_BOLD)
-                stdscr.addstr(1, 0, "="*width)
-                
-                # Instructions
-                instructions = "Use ↑/↓ arrows to navigate, Enter to select, 'q' to cancel"
-                stdscr.addstr(2, (width - len(instructions)) // 2, instructions)
-                stdscr.addstr(3, 0, "="*width)
-                
-                # Display controls
-                current_category = None
-                row = 4
-                
-                for idx, (name, desc, category) in enumerate(flat_controls):
-                    if row >= height - 2:
-                        break
-                    
-                    # Show category header if changed
-                    if category != current_category:
-                        if row < height - 2:
-                            stdscr.addstr(row, 0, f"\n{category}")
-                            row += 2
-                            current_category = category
-                    
-                    if row >= height - 2:
-                        break
-                    
-                    # Highlight selected item
-                    if idx == selected_idx:
-                        stdscr.addstr(row, 2, f"→ {name}", curses.A_REVERSE)
-                        stdscr.addstr(row, 4 + len(name), f" - {desc}", curses.A_REVERSE)
-                    else:
-                        stdscr.addstr(row, 2, f"  {name}")
-                        stdscr.addstr(row, 4 + len(name), f" - {desc}")
-                    
-                    row += 1
-                
-                stdscr.refresh()
-            
-            def select_with_curses(stdscr):
-                curses.curs_set(0)  # Hide cursor
-                selected_idx = 0
-                
-                while True:
-                    draw_menu(stdscr, selected_idx)
-                    key = stdscr.getch()
-                    
-                    if key == curses.KEY_UP and selected_idx > 0:
-                        selected_idx -= 1
-                    elif key == curses.KEY_DOWN and selected_idx < len(flat_controls) - 1:
-                        selected_idx += 1
-                    elif key == ord('\n') or key == curses.KEY_ENTER:
-                        return flat_controls[selected_idx][0]
-                    elif key == ord('q') or key == ord('Q'):
-                        return "rainbow_in_unison"  # Default
-            
-            result = curses.wrapper(select_with_curses)
-            return result
-            
-        except Exception as e:
-            print(f"TUI unavailable ({e}), using numbered menu...")
-    
-    # Fallback to numbered menu
-    print("\n" + "="*60)
-    print("INTERACTIVE CONTROL SELECTOR".center(60))
-    print("="*60)
-    
-    for idx, (name, desc, category) in enumerate(flat_controls):
-        print(f"  {idx+1:2d}) {name:20s} - {desc}")
-    
-    print("\n" + "="*60)
-    
-    while True:
-        try:
-            choice = input(f"Select control (1-{len(flat_controls)}) [1]: ").strip()
-            if not choice:
-                return flat_controls[0][0]
-            
-            idx = int(choice) - 1
-            if 0 <= idx < len(flat_controls):
-                return flat_controls[idx][0]
-            else:
-                print(f"Please enter a number between 1 and {len(flat_controls)}")
-        except ValueError:
-            print("Please enter a valid number")
-        except (EOFError, KeyboardInterrupt):
-            return "rainbow_in_unison"
-
-def choose_effect() -> str:
-    """
-    Display available controls menu and get user choice.
-    Now organized by category for better usability.
-    """
-    print("\n" + "="*60)
-    print("AVAILABLE CONTROLS".center(60))
-    print("="*60)
-    
-    print("\n🌈 RAINBOW CONTROLS:")
-    print("  rainbow_in_unison - all lights cycle colors together")
-    print("  rainbow           - lights cycle colors with offsets")
-    print("  party             - random colorful flashing")
-    print("  fungi             - psychedelic funky animation")
-    
-    print("\n🎃 THEMED CONTROLS:")
-    print("  spooky            - Halloween orange/purple flickers")
-    print("  seasonal          - colors based on current season")
-    print("  danger            - scary red strobe alarm")
-    
-    print("\n⛈️  NATURE CONTROLS:")
-    print("  lightning         - stormy skies with lightning")
-    print("  waterfall         - flowing blues and white")
-    
-    print("\n🎵 INTERACTIVE:")
-    print("  reactive          - responds to microphone audio")
-    print("  synth             - flash colors with number keys")
-    
-    print("\n⚙️  UTILITIES:")
-    print("  white             - set to white color temperature")
-    print("  rgba              - set custom RGBA color")
-    
-    print("\n📋 OPTIONS:")
-    print("  change_bulbs      - select different bulbs")
-    print("  rescan            - scan network for new bulbs")
-    
-    print("\n" + "="*60)
-    print("Type 'tui' for interactive menu or enter control name")
-    
-    choice = input("Choose control [rainbow_in_unison]: ").strip().lower()
-    
-    # Check if user wants TUI
-    if choice == "tui":
-        return choose_effect_tui()
-    
-    # Map choices to effect names
-    effect_map = {
-        "rainbow_in_unison": "rainbow_in_unison",
-        "rainbow": "rainbow",
-        "spooky": "spooky",
-        "white": "white",
-        "rgba": "rgba",
-        "party": "party",
-        "synth": "synth",
-        "reactive": "reactive",
-        "seasonal": "seasonal",
-        "danger": "danger",
-        "lightning": "lightning",
-        "waterfall": "waterfall",
-        "fungi": "fungi",
-        "change_bulbs": "change_bulbs",
-        "rescan": "rescan",
-    }
-    
-    # Allow partial matches for convenience
-    if not choice:
-        return "rainbow_in_unison"
-    
-    # Try exact match first
-    if choice in effect_map:
-        return effect_map[choice]
-    
-    # Try prefix matching
-    matches = [name for name in effect_map.keys() if name.startswith(choice)]
-    if len(matches) == 1:
-        return matches[0]
-    elif len(matches) > 1:
-        print(f"Ambiguous choice '{choice}'. Matches: {', '.join(matches)}")
-        print("Please use a more specific name.")
-        # Return first match as fallback instead of recursing
-        return matches[0]
-    
-    # No match found - return default instead of recursing
-    print(f"Unknown effect: '{choice}'. Using default (rainbow_in_unison).")
-    return "rainbow_in_unison"
+_KELVIN_HELP = (
+    "\nEnter desired white temperature in Kelvin.\n"
+    "Common values:\n"
+    "  2700K - Warm white (incandescent bulb, cozy/relaxing)\n"
+    "  3000K - Soft white (warm, inviting)\n"
+    "  4000K - Neutral white (balanced, natural)\n"
+    "  5000K - Cool white (bright, energetic)\n"
+    "  6500K - Daylight (very bright, blue-ish)\n"
+)
 
 def get_kelvin_temperature() -> int:
     """
     Prompt user to enter a color temperature in Kelvin with guidance.
     Returns the validated temperature value.
     """
-    print("\nEnter desired white temperature in Kelvin.")
-    print("Common values:")
-    print("  2700K - Warm white (incandescent bulb, cozy/relaxing)")
-    print("  3000K - Soft white (warm, inviting)")
-    print("  4000K - Neutral white (balanced, natural)")
-    print("  5000K - Cool white (bright, energetic)")
-    print("  6500K - Daylight (very bright, blue-ish)")
-    
-    while True:
-        try:
-            temp_str = input("Enter temperature in Kelvin [4000]: ").strip()
-            if not temp_str:
-                return 4000
-            temp = int(temp_str)
-            if temp < 1000 or temp > 10000:
-                print("Please enter a value between 1000K and 10000K.")
-                continue
-            return temp
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+    sys.stdout.write(_KELVIN_HELP)
+    return _prompt_int("Enter temperature in Kelvin [4000]: ", 4000, 1000, 10000, "K")
 
 def get_rgba_input() -> Tuple[int, int, int, int]:
     """
@@ -612,44 +370,9 @@ def get_rgba_input() -> Tuple[int, int, int, int]:
     print("\n=== RGBA Color Control ===")
     print("Enter color values:")
     
-    while True:
-        try:
-            r = input("Red (0-255) [255]: ").strip()
-            r = int(r) if r else 255
-            if 0 <= r <= 255:
-                break
-            print("Please enter a value between 0 and 255.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
-    
-    while True:
-        try:
-            g = input("Green (0-255) [255]: ").strip()
-            g = int(g) if g else 255
-            if 0 <= g <= 255:
-                break
-            print("Please enter a value between 0 and 255.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
-    
-    while True:
-        try:
-            b = input("Blue (0-255) [255]: ").strip()
-            b = int(b) if b else 255
-            if 0 <= b <= 255:
-                break
-            print("Please enter a value between 0 and 255.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
-    
-    while True:
-        try:
-            alpha = input("Dimming/Alpha (0-100, where 100=brightest) [100]: ").strip()
-            alpha = int(alpha) if alpha else 100
-            if 0 <= alpha <= 100:
-                break
-            print("Please enter a value between 0 and 100.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+    r = _prompt_int("Red (0-255) [255]: ", 255, 0, 255)
+    g = _prompt_int("Green (0-255) [255]: ", 255, 0, 255)
+    b = _prompt_int("Blue (0-255) [255]: ", 255, 0, 255)
+    alpha = _prompt_int("Dimming/Alpha (0-100, where 100=brightest) [100]: ", 100, 0, 100)
     
     return r, g, b, alpha